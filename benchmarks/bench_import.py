@@ -0,0 +1,103 @@
+"""
+CLI cold-start benchmark.
+
+Runs `python main.py --help` in fresh interpreters and reports the median wall
+time, then checks that no AI SDK was imported on the way: engines are loaded
+lazily by the engine registry, so commands that do not summarize must never
+pay for torch, transformers or the provider SDKs.
+
+Usage:
+    python -m benchmarks.bench_import --runs 5
+    python -m benchmarks.bench_import --max-seconds 3   # fail above a budget (CI)
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Modules that must stay out of the CLI start-up path
+HEAVY_MODULES = [
+    "torch",
+    "transformers",
+    "openai",
+    "anthropic",
+    "google.genai",
+    "groq",
+    "mistralai",
+    "ollama",
+]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = """
+import sys
+sys.argv = ["main.py", "--help"]
+import main
+try:
+    main.app()
+except SystemExit:
+    pass
+print("\\n".join(sorted(sys.modules)), file=sys.stderr)
+"""
+
+
+def _env(directory: str) -> dict:
+    env = dict(os.environ)
+    env["DB_URL"] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    return env
+
+
+def _time_help(env: dict) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "main.py", "--help"],
+        cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    return time.perf_counter() - start
+
+
+def _loaded_modules(env: dict) -> set:
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    return set(result.stderr.split())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark `python main.py --help` start-up time.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=0, help="Fail if the median exceeds this (0 = report only)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="aws-brief-bench-") as directory:
+        env = _env(directory)
+        # First run warms the filesystem cache and bytecode, like any later CLI call
+        _time_help(env)
+        timings = [_time_help(env) for _ in range(max(1, args.runs))]
+        loaded = _loaded_modules(env)
+
+    median = statistics.median(timings)
+    print(f"main.py --help over {len(timings)} runs: median {median:.3f}s, min {min(timings):.3f}s, max {max(timings):.3f}s")
+
+    failed = False
+    heavy = [name for name in HEAVY_MODULES if name in loaded]
+    if heavy:
+        print(f"FAIL: AI dependencies imported at start-up: {', '.join(heavy)}")
+        failed = True
+    else:
+        print("OK: no AI dependencies imported at start-up")
+
+    if args.max_seconds and median > args.max_seconds:
+        print(f"FAIL: median start-up time {median:.3f}s exceeds {args.max_seconds:.3f}s")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
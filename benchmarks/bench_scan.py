@@ -0,0 +1,106 @@
+"""
+Scan throughput benchmark against an offline feed corpus.
+
+Replays recorded feed bodies (FEED_FIXTURE_MODE=replay) into a throw-away
+SQLite database and reports feeds/sec, entries/sec, parse time and DB time
+for a cold scan (empty database) and a warm scan (conditional GET + high-water
+marks in effect).
+
+Record a real corpus once:
+    FEED_FIXTURE_MODE=record FEED_FIXTURE_DIR=fixtures/feeds python main.py scan --force
+
+Then compare scraper changes offline:
+    python -m benchmarks.bench_scan --fixtures fixtures/feeds --latency-ms 200
+    python -m benchmarks.bench_scan --synthetic 50   # no recording needed
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def _synthetic_feed(name: str, entries: int) -> bytes:
+    now = datetime.utcnow()
+    items = []
+    for i in range(entries):
+        published = (now - timedelta(hours=i * 6)).strftime("%a, %d %b %Y %H:%M:%S +0000")
+        slug = f"{name.lower().replace(' ', '-')}-{i}"
+        items.append(
+            f"<item><title>{name}: announcement {i} &amp; details</title>"
+            f"<link>https://aws.amazon.com/blogs/{slug}/</link><guid>https://aws.amazon.com/blogs/{slug}/</guid>"
+            f"<pubDate>{published}</pubDate><description><![CDATA["
+            + "<p>Today we are announcing <a href='https://aws.amazon.com/'>a new capability</a> "
+              "for <strong>production workloads</strong>.</p><img src='https://example.com/x.png'/>" * 6
+            + "<script>track();</script>]]></description></item>"
+        )
+    return (
+        f"<?xml version='1.0' encoding='UTF-8'?><rss version='2.0'><channel><title>{name}</title>"
+        + "".join(items) + "</channel></rss>"
+    ).encode()
+
+
+def _write_synthetic_corpus(directory: str, entries: int) -> None:
+    from src.core.replay import FeedFixtures
+    from src.utils.constants import AWS_FEEDS
+
+    fixtures = FeedFixtures(directory, "record")
+    for i, feed in enumerate(AWS_FEEDS):
+        fixtures.write(feed["url"], _synthetic_feed(feed["name"], entries), {"ETag": f'"synthetic-{i}"'})
+
+
+def _report(label: str, stats: dict) -> None:
+    total = stats["total_seconds"] or 1e-9
+    print(f"\n[{label}]")
+    print(f"  feeds polled    : {stats['feeds_polled']} ({stats['feeds_changed']} changed)")
+    print(f"  entries parsed  : {stats['entries_parsed']}")
+    print(f"  items added     : {stats['items_added']}")
+    print(f"  wall time       : {total:.3f}s")
+    print(f"  feeds/sec       : {stats['feeds_polled'] / total:.1f}")
+    print(f"  entries/sec     : {stats['entries_parsed'] / total:.1f}")
+    print(f"  fetch time      : {stats['fetch_seconds']:.3f}s (cumulative over workers)")
+    print(f"  parse time      : {stats['parse_seconds']:.3f}s (cumulative over workers)")
+    print(f"  db time         : {stats['db_seconds']:.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scan throughput on an offline feed corpus.")
+    parser.add_argument("--fixtures", default=None, help="Recorded fixture directory (default: FEED_FIXTURE_DIR)")
+    parser.add_argument("--synthetic", type=int, default=0, help="Generate a synthetic corpus with N entries per feed")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Simulated network latency per request")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--parse-processes", type=int, default=0)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="aws-brief-bench-")
+    fixtures_dir = args.fixtures or os.environ.get("FEED_FIXTURE_DIR", "fixtures/feeds")
+    if args.synthetic:
+        fixtures_dir = os.path.join(workdir, "fixtures")
+
+    # Settings are read at import time, so configure the environment first
+    os.environ["DB_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["FEED_FIXTURE_MODE"] = "replay"
+    os.environ["FEED_FIXTURE_DIR"] = fixtures_dir
+    os.environ["FEED_REPLAY_LATENCY_MS"] = str(args.latency_ms)
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    if args.synthetic:
+        _write_synthetic_corpus(fixtures_dir, args.synthetic)
+    elif not os.path.isdir(fixtures_dir):
+        parser.error(f"Fixture directory {fixtures_dir} not found. Record one or use --synthetic N.")
+
+    import main as cli
+
+    print(f"Corpus: {fixtures_dir} | latency: {args.latency_ms}ms | "
+          f"concurrency: {args.concurrency} | parse processes: {args.parse_processes}")
+
+    for label in ("cold scan", "warm scan"):
+        stats = {}
+        started = time.perf_counter()
+        cli._scan_feeds("all", args.concurrency, parse_processes=args.parse_processes, stats=stats)
+        stats["total_seconds"] = time.perf_counter() - started
+        _report(label, stats)
+
+
+if __name__ == "__main__":
+    main()
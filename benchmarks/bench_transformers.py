@@ -0,0 +1,127 @@
+"""
+Local summarization benchmark for the transformers engine backends.
+
+Loads the model once per backend (pytorch, int8, onnx), each in its own
+process so peak RSS is comparable, and reports load time, first-call latency,
+median single-item latency, batched throughput and peak RSS. Backends whose
+dependencies are missing are reported as skipped.
+
+Usage:
+    python -m benchmarks.bench_transformers --runs 5 --batch 16
+    python -m benchmarks.bench_transformers --backends int8,onnx --threads 4
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_TEXTS = [
+    "Amazon S3 now supports conditional writes. You can use the If-None-Match header to check whether "
+    "an object exists before creating it, which removes the need for extra API calls or client-side "
+    "locking when several writers create objects concurrently. Conditional writes are available in all "
+    "commercial AWS Regions at no additional cost through the S3 API, AWS SDKs and the AWS CLI.",
+    "AWS Lambda adds support for Python 3.13 as both a managed runtime and a container base image. "
+    "Developers can now build and run Lambda functions with the latest Python features, including the "
+    "improved interactive interpreter and experimental free-threaded build. The runtime is available in "
+    "all Regions where Lambda is available, including AWS GovCloud (US) and the China Regions.",
+    "Amazon RDS for PostgreSQL now supports minor versions 16.4, 15.8, 14.13, 13.16 and 12.20. These "
+    "releases contain bug fixes and security patches from the PostgreSQL community. We recommend that "
+    "you upgrade to the latest minor versions to fix known security vulnerabilities in prior versions "
+    "and to benefit from the fixes added by the community. Upgrades can be applied during the next "
+    "maintenance window or immediately, and Blue/Green Deployments minimise the downtime involved.",
+]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _child(model: str, runs: int, batch: int) -> dict:
+    from src.engines.transformers_client import TransformersEngine
+
+    started = time.perf_counter()
+    engine = TransformersEngine(model=model)
+    load_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    engine.summarize(SAMPLE_TEXTS[0])
+    first_call = time.perf_counter() - started
+
+    latencies = []
+    for i in range(runs):
+        started = time.perf_counter()
+        engine.summarize(SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)])
+        latencies.append(time.perf_counter() - started)
+
+    texts = [SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)] for i in range(batch)]
+    started = time.perf_counter()
+    engine.summarize_batch(texts)
+    batch_seconds = time.perf_counter() - started
+
+    return {
+        "load_seconds": load_seconds,
+        "first_call_seconds": first_call,
+        "median_seconds": statistics.median(latencies),
+        "batch_items_per_second": batch / batch_seconds,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _run_backend(backend: str, args) -> dict:
+    env = dict(os.environ)
+    env["TRANSFORMERS_BACKEND"] = backend
+    env["TRANSFORMERS_THREADS"] = str(args.threads)
+    # Measured separately as the first-call latency
+    env["TRANSFORMERS_WARMUP"] = "false"
+    env["SUMMARY_BATCH_SIZE"] = str(args.batch_size)
+    env.setdefault("LOG_LEVEL", "WARNING")
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_transformers", "--child",
+         "--model", args.model, "--runs", str(args.runs), "--batch", str(args.batch)],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        last_line = (result.stderr.strip().splitlines() or ["failed"])[-1]
+        return {"skipped": last_line}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the transformers engine backends on CPU.")
+    parser.add_argument("--model", default="facebook/bart-large-cnn")
+    parser.add_argument("--backends", default="pytorch,int8,onnx")
+    parser.add_argument("--threads", type=int, default=0, help="TRANSFORMERS_THREADS (0 = library default)")
+    parser.add_argument("--runs", type=int, default=5, help="Single-item calls timed per backend")
+    parser.add_argument("--batch", type=int, default=16, help="Items summarized in the throughput run")
+    parser.add_argument("--batch-size", type=int, default=8, help="Pipeline batch size (SUMMARY_BATCH_SIZE)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_child(args.model, args.runs, args.batch)))
+        return
+
+    print(f"Model: {args.model} | threads: {args.threads or 'default'} | batch: {args.batch} (size {args.batch_size})")
+    print(f"{'backend':<10}{'load (s)':>10}{'first (s)':>11}{'p50 (s)':>10}{'batch it/s':>12}{'items/h':>10}{'RSS (MB)':>10}")
+    for backend in [name.strip() for name in args.backends.split(",") if name.strip()]:
+        stats = _run_backend(backend, args)
+        if "skipped" in stats:
+            print(f"{backend:<10}skipped: {stats['skipped']}")
+            continue
+        print(
+            f"{backend:<10}{stats['load_seconds']:>10.1f}{stats['first_call_seconds']:>11.2f}"
+            f"{stats['median_seconds']:>10.2f}{stats['batch_items_per_second']:>12.2f}"
+            f"{stats['batch_items_per_second'] * 3600:>10.0f}{stats['peak_rss_mb']:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
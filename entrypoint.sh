@@ -8,6 +8,30 @@ if [ "$1" = "daemon" ]; then
     # Init DB once
     python main.py init-db
     
+    # Local transformers engine: keep the model loaded in a worker instead of
+    # reloading it in every cycle
+    # (settings may come from .env, so ask the app instead of reading the environment)
+    if python -c "from src.utils.config import settings as s; exit(not (s.DEFAULT_AI_ENGINE == 'transformers' and s.TRANSFORMERS_SERVER_URL))"; then
+        echo "Starting transformers inference worker..."
+        python main.py serve-transformers &
+        WORKER_PID=$!
+        trap 'kill $WORKER_PID 2>/dev/null' EXIT
+        
+        # Wait until the worker accepts connections (the engine itself waits while the model loads)
+        for _ in $(seq 1 30); do
+            python -c "
+import urllib.error, urllib.request
+from src.utils.config import settings
+url = settings.TRANSFORMERS_SERVER_URL.rstrip('/')
+try:
+    urllib.request.urlopen(url + '/health', timeout=1)
+except urllib.error.HTTPError:
+    pass  # 503 while the model is loading
+" 2>/dev/null && break
+            sleep 1
+        done
+    fi
+    
     while true; do
         echo "[$(date)] Running Process Cycle..."
         # Capture exit code so script doesn't die on temporary python error
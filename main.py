@@ -1,10 +1,20 @@
 import typer
 import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 from typing import Optional
 from src.utils.config import settings
-from src.core.database import db_manager, NewsItem
-from src.core.scraper import FeedScraper
-from src.engines.factory import EngineFactory
+from src.core.database import db_manager, backfill_summary_fields, insert_news_items, NewsItem, FeedState
+from src.core.scraper import FeedScraper, parse_feed_records
+from src.core.scheduler import feed_scheduler
+from src.core.summary_cache import summary_cache
+from src.core.digest import DigestPipeline
+from src.utils.tokens import TokenCounter, token_usage
+from src.utils.prompts import IMPACT_LEVELS
+from src.engines.factory import engine_pool
 from src.core.filter import FilterEngine, FilterAction
 from sqlalchemy.orm import Session
 
@@ -27,10 +37,18 @@ DEFAULT_FEED_URL = "all"
 def init_db():
     """
     Initialize the database tables.
+    Also fills impact level and action flag of summaries stored before those columns existed.
     """
     try:
         db_manager._init_db()
         typer.echo("Database initialized successfully.")
+        db = db_manager.get_session()
+        try:
+            backfilled = backfill_summary_fields(db)
+        finally:
+            db.close()
+        if backfilled:
+            typer.echo(f"Parsed impact level and action flag for {backfilled} existing summaries.")
     except (IOError, OSError) as e:
         typer.echo(f"Database initialization failed: {e}", err=True)
         raise typer.Exit(1)
@@ -38,13 +56,155 @@ def init_db():
         typer.echo(f"Unexpected error during database initialization: {e}", err=True)
         raise typer.Exit(1)
 
-@app.command()
-def scan(url: str = typer.Option(DEFAULT_FEED_URL, help="Feed URL to scan, or 'all' for all default feeds.")):
+def _fetch_feed(scraper: FeedScraper, target: dict, snapshot: Optional[dict] = None, parse_pool: Optional[ProcessPoolExecutor] = None) -> dict:
     """
-    Trigger a manual scan of AWS news sources.
+    Fetch and parse a single feed. Runs inside the scan worker pool.
+
+    Returns the conditional fetch result extended with the parse result
+    ('items', 'last_source_id', 'last_published_at'). Parsing is skipped
+    when the feed did not change and stops at the feed's high-water mark.
+    When `parse_pool` is given, parsing runs in a worker process.
+    """
+    logger.info(f"Scanning {target['name']} ({target['url']})...")
+    snapshot = snapshot or {}
+    started = time.perf_counter()
+    result = scraper.fetch_conditional(
+        target["url"],
+        etag=snapshot.get("etag"),
+        last_modified=snapshot.get("last_modified"),
+        body_hash=snapshot.get("body_hash")
+    )
+    result["fetch_seconds"] = time.perf_counter() - started
+    result["parse_seconds"] = 0.0
+    if result["modified"]:
+        started = time.perf_counter()
+        parse_args = (result["content"], snapshot.get("last_source_id"), snapshot.get("last_published_at"))
+        if parse_pool:
+            result.update(parse_pool.submit(parse_feed_records, *parse_args).result())
+        else:
+            result.update(scraper.parse_feed(*parse_args))
+        result["content"] = None # Not needed anymore, free it early
+        result["parse_seconds"] = time.perf_counter() - started
+    else:
+        result["items"] = []
+    return result
+
+def _update_feed_state(db: Session, state: Optional[FeedState], url: str, result: dict) -> FeedState:
+    """
+    Persist the cache validators of a polled feed and, when it changed, its
+    body hash and high-water mark.
+    """
+    if state is None:
+        state = FeedState(url=url)
+        db.add(state)
+    # An unchanged body can come with new validators (e.g. a reissued ETag);
+    # keep the latest ones or every later poll downloads the feed again
+    state.etag = result["etag"]
+    state.last_modified = result["last_modified"]
+    if not result["modified"]:
+        return state
+    state.body_hash = result["body_hash"]
+    state.last_changed_at = datetime.utcnow()
+    if result.get("last_source_id"):
+        state.last_source_id = result["last_source_id"]
+    if result.get("last_published_at") and (
+        state.last_published_at is None or result["last_published_at"] > state.last_published_at
+    ):
+        state.last_published_at = result["last_published_at"]
+    return state
+
+def _collect_new_items(db: Session, target: dict, parsed_items: list, filter_engine: FilterEngine, seen_ids: set) -> list:
+    """
+    Apply filters to the not-yet-stored items of a single feed.
+
+    Duplicates are resolved with one `IN (...)` lookup per feed, and `seen_ids`
+    drops items already collected from another feed during the same scan.
+
+    Returns:
+        List of row dictionaries ready for bulk insert
+    """
+    candidates = [item for item in parsed_items if item["source_id"] not in seen_ids]
+    if not candidates:
+        return []
+    
+    source_ids = [item["source_id"] for item in candidates]
+    existing = {
+        source_id for (source_id,) in
+        db.query(NewsItem.source_id).filter(NewsItem.source_id.in_(source_ids))
+    }
+    
+    rows = []
+    for item_data in candidates:
+        if item_data["source_id"] in existing or item_data["source_id"] in seen_ids:
+            continue
+        seen_ids.add(item_data["source_id"])
+        
+        # Append Feed Name to tags
+        base_tag = target["name"]
+        
+        # --- FILTER EVALUATION ---
+        action = filter_engine.evaluate(item_data["title"])
+        
+        # Default state
+        should_notify = False # Pending processing
+        tag_suffix = ""
+
+        if action == FilterAction.IGNORE:
+            should_notify = True # Mark as 'read' so it's skipped
+            tag_suffix = " [IGNORED]"
+        elif action == FilterAction.DIGEST_ONLY:
+            should_notify = True # Mark as 'read' so it's skipped by realtime cycle
+            tag_suffix = " [DIGEST]"
+        
+        item_data["tags"] = f"{base_tag}{tag_suffix}"
+        item_data["is_notified"] = should_notify
+        rows.append(item_data)
+        
+        # Log action if filtered
+        if action != FilterAction.NOTIFY:
+             logger.info(f"  -> Rule Applied: {item_data['title'][:30]}... -> {action}")
+
+    return rows
+
+def _scan_feeds(
+    url: str = DEFAULT_FEED_URL,
+    concurrency: int = 1,
+    force: bool = False,
+    parse_processes: int = 0,
+    due_only: bool = False,
+    stats: Optional[dict] = None
+) -> int:
+    """
+    Scan feeds and store new items.
+
+    Fetching and parsing run in a bounded thread pool so slow feeds overlap.
+    With `parse_processes` > 0, CPU-bound parsing is offloaded to a process pool.
+    Duplicate checks run on the calling thread as feeds complete, and all new
+    items plus feed state updates are written in a single transaction at the end.
+    Feeds answering 304 Not Modified (or returning an identical body) are skipped,
+    and parsing stops at each feed's high-water mark. Every successful poll is
+    recorded by the adaptive scheduler; with `due_only`, feeds whose next poll
+    time has not come yet are not requested at all.
+
+    Args:
+        url: Feed URL to scan, or 'all' for all default feeds
+        concurrency: Maximum number of feeds fetched in parallel
+        force: Ignore stored cache validators and high-water marks, re-processing every feed
+        parse_processes: Worker processes for feed parsing (0 = parse in the scan threads)
+        due_only: Only poll feeds that are due according to the adaptive scheduler
+        stats: Optional dict filled with scan metrics (feed/entry counts and timings)
+
+    Returns:
+        Total number of new items added
     """
     logger.info(f"Starting scan request for: {url}")
-    scraper = FeedScraper()
+    scan_started = time.perf_counter()
+    stats = stats if stats is not None else {}
+    stats.update({
+        "feeds_polled": 0, "feeds_changed": 0, "entries_parsed": 0, "items_added": 0,
+        "fetch_seconds": 0.0, "parse_seconds": 0.0, "db_seconds": 0.0, "total_seconds": 0.0
+    })
+    scraper = FeedScraper() # Thread-safe: shares the pooled HTTP client and rate limiter
     filter_engine = FilterEngine() # Load filters if available
     
     targets = []
@@ -53,62 +213,155 @@ def scan(url: str = typer.Option(DEFAULT_FEED_URL, help="Feed URL to scan, or 'a
     else:
         targets = [{"name": "Custom", "url": url}]
 
-    total_new = 0
-    
-    for target in targets:
-        feed_url = target["url"]
-        logger.info(f"Scanning {target['name']} ({feed_url})...")
+    db = db_manager.get_session()
+    try:
+        # Load cache validators once, before any worker starts
+        feed_states = {
+            state.url: state
+            for state in db.query(FeedState).filter(FeedState.url.in_([t["url"] for t in targets])).all()
+        }
+        snapshots = {}
+        if not force:
+            snapshots = {
+                feed_url: {
+                    "etag": state.etag,
+                    "last_modified": state.last_modified,
+                    "body_hash": state.body_hash,
+                    "last_source_id": state.last_source_id,
+                    "last_published_at": state.last_published_at
+                }
+                for feed_url, state in feed_states.items()
+            }
+
+        if due_only:
+            now = datetime.utcnow()
+            due = [t for t in targets if feed_scheduler.is_due(feed_states.get(t["url"]), now)]
+            logger.info(f"{len(due)}/{len(targets)} feeds due for polling.")
+            targets = due
+            if not targets:
+                return 0
+
+        new_rows = []
+        seen_ids = set()
+        polled_feeds = []
+        skipped = 0
+        workers = max(1, min(concurrency, len(targets)))
+        
+        parse_pool = None
+        if parse_processes > 0:
+            # Never fork the threaded scan process itself: forkserver forks workers from a
+            # clean single-threaded server (spawn where forkserver is unavailable, e.g. Windows)
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            parse_pool = ProcessPoolExecutor(max_workers=parse_processes, mp_context=multiprocessing.get_context(start_method))
+        
         try:
-            content = scraper.fetch(feed_url)
-            parsed_items = scraper.parse(content)
-            
-            db = db_manager.get_session()
-            count = 0
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scan") as pool:
+                futures = {
+                    pool.submit(_fetch_feed, scraper, target, snapshots.get(target["url"]), parse_pool): target
+                    for target in targets
+                }
             
-            for item_data in parsed_items:
-                # Check for duplicates using source_id
-                exists = db.query(NewsItem).filter(NewsItem.source_id == item_data["source_id"]).first()
-                if not exists:
-                    # Append Feed Name to tags
-                    base_tag = target["name"]
+                for future in as_completed(futures):
+                    target = futures[future]
+                    try:
+                        result = future.result()
+                        polled_feeds.append((target, result))
+                        stats["feeds_polled"] += 1
+                        stats["fetch_seconds"] += result["fetch_seconds"]
+                        stats["parse_seconds"] += result["parse_seconds"]
+                        stats["entries_parsed"] += len(result["items"])
+                        if not result["modified"]:
+                            skipped += 1
+                            continue
                     
-                    # --- FILTER EVALUATION ---
-                    action = filter_engine.evaluate(item_data["title"])
+                        stats["feeds_changed"] += 1
+                        started = time.perf_counter()
+                        rows = _collect_new_items(db, target, result["items"], filter_engine, seen_ids)
+                        stats["db_seconds"] += time.perf_counter() - started
+                        new_rows.extend(rows)
+                        logger.info(f"  > Found {len(rows)} new items in {target['name']}.")
                     
-                    # Default state
-                    should_notify = False # Pending processing
-                    tag_suffix = ""
-
-                    if action == FilterAction.IGNORE:
-                        should_notify = True # Mark as 'read' so it's skipped
-                        tag_suffix = " [IGNORED]"
-                    elif action == FilterAction.DIGEST_ONLY:
-                        should_notify = True # Mark as 'read' so it's skipped by realtime cycle
-                        tag_suffix = " [DIGEST]"
-                    
-                    item_data["tags"] = f"{base_tag}{tag_suffix}"
-                    item_data["is_notified"] = should_notify
-                    
-                    new_item = NewsItem(**item_data)
-                    db.add(new_item)
-                    
-                    # Log action if filtered
-                    if action != FilterAction.NOTIFY:
-                         logger.info(f"  -> Rule Applied: {item_data['title'][:30]}... -> {action}")
-
-                    count += 1
+                    except Exception as e:
+                        logger.error(f"Failed to scan {target['url']}: {e}")
+                        # Continue to next feed
+        finally:
+            if parse_pool:
+                parse_pool.shutdown()
+        
+        if skipped:
+            logger.info(f"Skipped {skipped} unchanged feeds.")
+        
+        if not polled_feeds:
+            return 0
+        
+        # Single write transaction for the whole scan
+        started = time.perf_counter()
+        try:
+            db_manager.begin_write(db)
+            # Skipped conflicts (a concurrent scan got there first) are not counted
+            added = insert_news_items(db, new_rows)
+            db.flush()
             
+            now = datetime.utcnow()
+            history = feed_scheduler.publish_history(db, [target for target, _ in polled_feeds])
+            for target, result in polled_feeds:
+                state = feed_states.get(target["url"])
+                state = _update_feed_state(db, state, target["url"], result)
+                interval = feed_scheduler.interval_for(target, history[target["name"]], now)
+                feed_scheduler.record_poll(state, interval, now)
             db.commit()
-            db.close()
-            total_new += count
-            logger.info(f"  > Added {count} new items from {target['name']}.")
-            
         except Exception as e:
-            logger.error(f"Failed to scan {feed_url}: {e}")
-            # Continue to next feed
-    
+            db.rollback()
+            logger.error(f"Failed to store scan results: {e}")
+            return 0
+        stats["db_seconds"] += time.perf_counter() - started
+        
+        stats["items_added"] = added
+        return added
+    finally:
+        db.close()
+        stats["total_seconds"] = time.perf_counter() - scan_started
+        logger.info(
+            f"Scan stats: {stats['feeds_polled']} feeds polled ({stats['feeds_changed']} changed), "
+            f"{stats['entries_parsed']} entries parsed, {stats['items_added']} added in {stats['total_seconds']:.2f}s "
+            f"(fetch {stats['fetch_seconds']:.2f}s, parse {stats['parse_seconds']:.2f}s, db {stats['db_seconds']:.2f}s)"
+        )
+
+@app.command()
+def scan(
+    url: str = typer.Option(DEFAULT_FEED_URL, help="Feed URL to scan, or 'all' for all default feeds."),
+    concurrency: int = typer.Option(settings.SCAN_CONCURRENCY, help="Number of feeds fetched in parallel (1 = sequential)."),
+    force: bool = typer.Option(False, "--force", help="Ignore cached ETag/Last-Modified and high-water marks, re-processing every feed."),
+    parse_processes: int = typer.Option(settings.SCAN_PARSE_PROCESSES, help="Worker processes for feed parsing (0 = parse in scan threads)."),
+    due_only: bool = typer.Option(False, "--due-only", help="Only poll feeds that are due according to the adaptive scheduler.")
+):
+    """
+    Trigger a manual scan of AWS news sources.
+    """
+    total_new = _scan_feeds(url, concurrency, force, parse_processes, due_only)
     typer.echo(f"Scan complete. Total added: {total_new} new items.")
 
+@app.command()
+def feed_schedule():
+    """
+    Show the adaptive polling schedule of all default feeds.
+    """
+    db = db_manager.get_session()
+    try:
+        states = {state.url: state for state in db.query(FeedState).all()}
+        now = datetime.utcnow()
+        
+        for target in AWS_FEEDS:
+            state = states.get(target["url"])
+            if not state or not state.next_poll_at:
+                typer.echo(f"[DUE]      {'-':>8}  {target['name']} (never polled)")
+                continue
+            status = "[DUE]" if feed_scheduler.is_due(state, now) else "[WAITING]"
+            next_in = max(0, int((state.next_poll_at - now).total_seconds()))
+            typer.echo(f"{status:<10} {state.poll_interval:>7}s  {target['name']} (next poll in {next_in}s)")
+    finally:
+        db.close()
+
 @app.command()
 def summarize(
     item_id: int = typer.Option(..., help="The ID of the news item to summarize"), 
@@ -135,10 +388,9 @@ def summarize(
 
         typer.echo(f"Summarizing '{item.title}' using {engine} ({target_model})...")
         
-        ai_engine = EngineFactory.get_engine(engine, target_model)
-        summary = ai_engine.summarize(item.content or item.title)
+        summary = summary_cache.summarize(item.content or item.title, engine, target_model)
         
-        item.summary = summary
+        item.set_summary(summary, engine)
         db.commit()
         
         typer.echo("Summary generated successfully:")
@@ -150,8 +402,32 @@ def summarize(
     finally:
         db.close()
 
+def _filter_summary_fields(query, impact: Optional[str], action_required: bool):
+    """
+    Filter a NewsItem query on the impact level and action columns parsed from summaries.
+
+    Args:
+        query: NewsItem query
+        impact: Comma-separated impact levels (e.g. "CRITICAL,HIGH"), None for all
+        action_required: Only keep items whose summary requires an action
+    """
+    if impact:
+        levels = [level.strip().upper() for level in impact.split(",") if level.strip()]
+        unknown = [level for level in levels if level not in IMPACT_LEVELS]
+        if unknown:
+            raise typer.BadParameter(f"Unknown impact level(s) {', '.join(unknown)}, expected {', '.join(IMPACT_LEVELS)}")
+        query = query.filter(NewsItem.impact_level.in_(levels))
+    if action_required:
+        query = query.filter(NewsItem.action_required.is_(True))
+    return query
+
 @app.command()
-def list_news(limit: int = 10, pending_summary: bool = False):
+def list_news(
+    limit: int = 10,
+    pending_summary: bool = False,
+    impact: Optional[str] = typer.Option(None, help="Only items with these impact levels (comma-separated, e.g. CRITICAL,HIGH)"),
+    action_required: bool = typer.Option(False, "--action-required", help="Only items whose summary requires an action")
+):
     """
     List news items.
     """
@@ -160,6 +436,7 @@ def list_news(limit: int = 10, pending_summary: bool = False):
         query = db.query(NewsItem)
         if pending_summary:
             query = query.filter(NewsItem.summary == None)
+        query = _filter_summary_fields(query, impact, action_required)
         
         items = query.order_by(NewsItem.published_at.desc()).limit(limit).all()
         
@@ -170,7 +447,8 @@ def list_news(limit: int = 10, pending_summary: bool = False):
         for item in items:
             status = "[SUMMARIZED]" if item.summary else "[PENDING]"
             category = f"[{item.tags}]" if item.tags else "[General]"
-            typer.echo(f"{item.id}: {status} {category} {item.title} ({item.published_at})")
+            impact_label = f" [{item.impact_level}{', ACTION' if item.action_required else ''}]" if item.impact_level else ""
+            typer.echo(f"{item.id}: {status}{impact_label} {category} {item.title} ({item.published_at})")
             
     finally:
         db.close()
@@ -235,7 +513,7 @@ def verify_config():
     summary = ""
     
     try:
-        engine = EngineFactory.get_engine(engine_type, model)
+        engine = engine_pool.get(engine_type, model)
         if not engine:
             typer.echo(f"❌ AI Init: Failed (Library not installed?)")
         else:
@@ -279,12 +557,80 @@ def verify_config():
 
     typer.echo("\n✨ Verification Complete.")
 
+def _summarize_items(db: Session, items: list, engine: str, model: str, workers: int) -> int:
+    """
+    Summarize items without a summary using a pool of worker threads.
+
+    Items with identical content share one summary, and unique texts are sent
+    to the engine in batches of SUMMARY_BATCH_SIZE (`summarize_batch`). Workers
+    only talk to the AI engine and the summary cache; ORM objects are updated
+    and committed in this thread as each batch finishes, so a later failure
+    never loses finished work.
+
+    Returns:
+        Number of items summarized
+    """
+    groups = {}
+    for item in items:
+        if item.summary:
+            continue
+        text_to_summarize = item.content or item.title
+        key = summary_cache.key_for(text_to_summarize, engine, model)
+        groups.setdefault(key, (text_to_summarize, []))[1].append(item)
+
+    if not groups:
+        return 0
+
+    unique = list(groups.values())
+    batch_size = max(1, settings.SUMMARY_BATCH_SIZE)
+    batches = [unique[i:i + batch_size] for i in range(0, len(unique), batch_size)]
+
+    # A local model already uses every core, parallel calls would only compete for them
+    if engine.lower() == "transformers":
+        workers = 1
+    elif engine.lower() == "ollama":
+        # More workers than server slots would only queue up in the engine
+        workers = min(workers, settings.OLLAMA_NUM_PARALLEL)
+    workers = max(1, min(workers, len(batches)))
+    logger.info(f"Summarizing {sum(len(group) for _, group in unique)} items with {model} ({len(batches)} batches, {workers} workers)...")
+
+    summarized = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(summary_cache.summarize_batch, [text_to_summarize for text_to_summarize, _ in batch], engine, model): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                summaries = future.result()
+            except Exception as e:
+                logger.error(f"Error summarizing items {[group[0].id for _, group in batch]}: {e}")
+                continue
+            for (_, group), summary in zip(batch, summaries):
+                for item in group:
+                    item.set_summary(summary, engine)
+            try:
+                db.commit() # Commit each batch immediately so we don't lose it if notification fails
+                summarized += sum(len(group) for _, group in batch)
+            except Exception as e:
+                logger.error(f"Failed to store summaries: {e}")
+                db.rollback()
+    return summarized
+
+def _prewarm_engine(engine: str, model: str) -> None:
+    try:
+        engine_pool.get(engine, model).warm()
+    except Exception as e:
+        logger.warning(f"Pre-warming {engine} ({model}) failed: {e}")
+
 @app.command()
 def process_cycle(
     channels: str = typer.Option(settings.DEFAULT_NOTIFY_CHANNELS, help="Comma separated list of channels"), 
     engine: str = typer.Option(settings.DEFAULT_AI_ENGINE, help="AI Engine to use"),
     model: Optional[str] = typer.Option(settings.DEFAULT_AI_MODEL, help="Model name"),
-    limit: int = 5
+    limit: int = 5,
+    workers: int = typer.Option(settings.SUMMARY_WORKERS, help="Items summarized in parallel (1 = sequential)")
 ):
     """
     Run a full automation cycle: Scan -> Summarize -> Notify.
@@ -292,8 +638,18 @@ def process_cycle(
     """
     logger.info(f"Starting automation cycle (Engine: {engine}, Channels: {channels})...")
     
+    if engine.lower() == "ollama" and settings.OLLAMA_PREWARM:
+        # Load the model on the Ollama server while the feeds are scanned
+        threading.Thread(target=_prewarm_engine, args=(engine, model or settings.DEFAULT_AI_MODEL), daemon=True).start()
+    
     # 1. Scan
-    scan()
+    total_new = _scan_feeds(
+        DEFAULT_FEED_URL,
+        settings.SCAN_CONCURRENCY,
+        parse_processes=settings.SCAN_PARSE_PROCESSES,
+        due_only=settings.ADAPTIVE_POLLING
+    )
+    logger.info(f"Scan complete. Total added: {total_new} new items.")
     
     # 2. Process Pending Items
     db = db_manager.get_session()
@@ -328,15 +684,16 @@ def process_cycle(
 
         notifiers = NotificationFactory.get_notifiers(channels.split(","))
 
+        # Summarize all pending items concurrently before notifying
+        target_model = model or settings.DEFAULT_AI_MODEL
+        _summarize_items(db, pending_items, engine, target_model, workers)
+        token_usage.log_summary()
+
         for item in pending_items:
             try:
-                # Summarize if needed
                 if not item.summary:
-                    target_model = model or settings.DEFAULT_AI_MODEL
-                    logger.info(f"Summarizing item {item.id} with {target_model}...")
-                    ai_engine = EngineFactory.get_engine(engine, target_model)
-                    item.summary = ai_engine.summarize(item.content or item.title)
-                    db.commit() # Commit summary immediately so we don't lose it if notification fails
+                    # Summarization failed (already logged), retry on the next cycle
+                    continue
 
                 # Notify
                 all_sent = True
@@ -365,9 +722,14 @@ def process_cycle(
     finally:
         db.close()
     
+    summary_cache.evict()
     logger.info("Automation cycle complete.")
 
-from datetime import datetime, timedelta
+def _digest_group(item) -> str:
+    """
+    Digest chunk an item belongs to: its feed name, without the filter suffix.
+    """
+    return (item.tags or "General").split(" [")[0]
 
 @app.command()
 def send_digest(
@@ -389,7 +751,9 @@ def send_digest(
         # Ideally we parse date, but for now let's grab last 50 items and filter via python or simple limit
         # Better: Items created_at >= since_date
         
-        items = db.query(NewsItem).filter(NewsItem.created_at >= since_date).all()
+        items = db.query(NewsItem).filter(
+            NewsItem.created_at >= since_date
+        ).order_by(NewsItem.published_at.desc()).all()
         
         if not items:
             logger.info("No news found in the specified period.")
@@ -397,21 +761,17 @@ def send_digest(
 
         logger.info(f"Found {len(items)} items. Preparing summary...")
         
-        # Create a consolidated text for AI
-        digest_content = ""
-        for item in items:
-            category = item.tags or "General"
-            
-            # Skip IGNORED items from Digest
-            if "[IGNORED]" in category:
-                continue
-                
-            digest_content += f"- [{category}] {item.title}: {item.summary or 'No summary'}\n"
-        
-        # Limit content length to avoid token limits (arbitrary safety cut)
-        digest_content = digest_content[:15000] 
+        target_model = model or settings.DEFAULT_AI_MODEL
+
+        # Create a consolidated text for AI, skipping IGNORED items
+        entries = [
+            (_digest_group(item), f"- [{item.tags or 'General'}] {item.title}: {item.summary or 'No summary'}")
+            for item in items
+            if "[IGNORED]" not in (item.tags or "General")
+        ]
 
-        prompt = f"""
+        def build_prompt(digest_content: str) -> str:
+            return f"""
         Review the following list of AWS updates from the last {days} days.
         Group them by category (e.g., Security, Compute, Database).
         Provide a "Weekly Executive Summary" highlighting the most critical updates.
@@ -420,15 +780,14 @@ def send_digest(
         Updates:
         {digest_content}
         """
-        
-        target_model = model or settings.DEFAULT_AI_MODEL
-        ai_engine = EngineFactory.get_engine(engine, target_model)
-        
+
         try:
-            full_report = ai_engine.summarize(prompt)
+            # Periods larger than the context window are condensed per feed first (map-reduce)
+            full_report = DigestPipeline(engine, target_model).run(entries, build_prompt)
         except Exception as e:
             logger.error(f"Failed to generate digest: {e}")
             return
+        token_usage.log_summary()
 
         # Send Report
         logger.info("Sending Digest...")
@@ -448,13 +807,15 @@ def send_digest(
     finally:
         db.close()
 
-if __name__ == "__main__":
-    app()
-
 # ============================================================================
 # Smart Digest Helper Functions
 # ============================================================================
 
+# Tokens per item in the smart digest prompt (title, date, category and a summary preview)
+SMART_DIGEST_ENTRY_TOKENS = 120
+# Items listed per section of the SQL digest
+SQL_DIGEST_MAX_ITEMS = 25
+
 def _get_recent_items(days: int):
     """
     Get news items from the last N days.
@@ -496,22 +857,22 @@ def _generate_smart_digest(items, engine_type: str, model: str, days: int = 7) -
     if not items:
         return "No items to analyze."
     
-    # Limit to 50 items to avoid token limits
-    if len(items) > 50:
-        logger.warning(f"Too many items ({len(items)}). Using first 50 for analysis.")
-        items = items[:50]
-    
-    # Prepare items summary for AI
-    items_text = ""
+    # Prepare items summary for AI; summaries are trimmed to a short preview
+    counter = TokenCounter(model)
+    entries = []
     for i, item in enumerate(items, 1):
-        items_text += f"{i}. {item.title}\n"
+        entry = f"{item.title}\n"
+        entry += f"   Published: {item.published_at.strftime('%Y-%m-%d')}\n"
+        entry += f"   Category: {item.tags or 'General'}\n"
+        if item.impact_level:
+            entry += f"   Impact: {item.impact_level}{' (action required)' if item.action_required else ''}\n"
         if item.summary:
-            items_text += f"   Summary: {item.summary[:200]}...\n"
-        items_text += f"   Published: {item.published_at.strftime('%Y-%m-%d')}\n"
-        items_text += f"   Category: {item.tags or 'General'}\n\n"
-    
+            entry += f"   Summary: {item.summary}\n"
+        entries.append((_digest_group(item), f"{i}. {counter.truncate(entry, SMART_DIGEST_ENTRY_TOKENS)}\n"))
+
     # AI Prompt
-    prompt = f"""Analyze these AWS updates and create a smart digest.
+    def build_prompt(items_text: str) -> str:
+        return f"""Analyze these AWS updates and create a smart digest.
 
 Updates to analyze:
 {items_text}
@@ -552,11 +913,10 @@ New Features: X
 Keep it concise and actionable. Use emojis for visual appeal.
 Language: {settings.SUMMARY_LANGUAGE}
 """
-    
+
     # Generate with AI
     try:
-        ai_engine = EngineFactory.get_engine(engine_type, model)
-        digest = ai_engine.summarize(prompt)
+        digest = DigestPipeline(engine_type, model).run(entries, build_prompt)
         
         # Add header and footer
         end_date = datetime.utcnow()
@@ -605,6 +965,82 @@ def _generate_simple_digest_fallback(items) -> str:
     return digest
 
 
+def _generate_sql_digest(days: int = 7) -> Optional[str]:
+    """
+    Build the smart digest from the impact level and action columns, without an AI call.
+
+    Counts and the action-required / high-impact lists come from indexed
+    queries, so the cost does not grow with the summaries' length.
+    
+    Args:
+        days: Number of days to look back
+        
+    Returns:
+        Formatted digest string, or None when there are no items
+    """
+    from sqlalchemy import case, func, or_
+
+    end_date = datetime.utcnow()
+    start_date = end_date - timedelta(days=days)
+    db = db_manager.get_session()
+    try:
+        recent = db.query(NewsItem).filter(NewsItem.published_at >= start_date)
+        counts = dict(
+            db.query(NewsItem.impact_level, func.count(NewsItem.id))
+            .filter(NewsItem.published_at >= start_date)
+            .group_by(NewsItem.impact_level)
+            .all()
+        )
+        total = sum(counts.values())
+        if not total:
+            return None
+
+        # Most severe first, then newest
+        severity = case(
+            {level: rank for rank, level in enumerate(IMPACT_LEVELS)},
+            value=NewsItem.impact_level,
+            else_=len(IMPACT_LEVELS)
+        )
+        sections = []
+        for title, query in (
+            ("🚨 ACTION REQUIRED", recent.filter(NewsItem.action_required.is_(True))),
+            ("🔥 HIGH IMPACT", recent.filter(
+                NewsItem.impact_level.in_(["CRITICAL", "HIGH"]),
+                or_(NewsItem.action_required.is_(None), NewsItem.action_required.is_(False))
+            )),
+        ):
+            items = query.order_by(severity, NewsItem.published_at.desc()).limit(SQL_DIGEST_MAX_ITEMS).all()
+            sections.append((title, items, query.count() if len(items) == SQL_DIGEST_MAX_ITEMS else len(items)))
+    finally:
+        db.close()
+
+    def section(title: str, items, count: int) -> str:
+        text = f"{title} ({count} items)\n"
+        for i, item in enumerate(items, 1):
+            text += f"{i}. [{item.impact_level or 'UNRATED'}] {item.title} ({item.published_at.strftime('%Y-%m-%d')})\n"
+            text += f"   {item.url}\n"
+        if count > len(items):
+            text += f"   ... and {count - len(items)} more\n"
+        return text + "\n"
+
+    digest = f"📊 AWS Brief - Smart Digest ({start_date.strftime('%b %d')}-{end_date.strftime('%b %d, %Y')})\n\n"
+    digest += "━" * 60 + "\n\n"
+    for title, items, count in sections:
+        if items:
+            digest += section(title, items, count)
+
+    digest += "📌 SUMMARY\n"
+    digest += f"Total Updates: {total}\n"
+    digest += f"Action Required: {sections[0][2]}\n"
+    for level in IMPACT_LEVELS:
+        if counts.get(level):
+            digest += f"{level.title()}: {counts[level]}\n"
+    if counts.get(None):
+        digest += f"Not rated: {counts[None]}\n"
+    digest += "━" * 60
+    return digest
+
+
 # ============================================================================
 # Smart Digest Command
 # ============================================================================
@@ -614,7 +1050,8 @@ def send_smart_digest(
     days: int = typer.Option(7, help="Number of days to look back"),
     channels: str = typer.Option(settings.DEFAULT_NOTIFY_CHANNELS, help="Comma-separated channels"),
     engine: str = typer.Option(settings.DEFAULT_AI_ENGINE, help="AI engine to use"),
-    model: Optional[str] = typer.Option(settings.DEFAULT_AI_MODEL, help="AI model name")
+    model: Optional[str] = typer.Option(settings.DEFAULT_AI_MODEL, help="AI model name"),
+    sql: bool = typer.Option(False, "--sql", help="Build the digest from the stored impact level and action columns, without an AI call")
 ):
     """
     Send an AI-powered smart digest with categorization and prioritization.
@@ -624,27 +1061,38 @@ def send_smart_digest(
     - COST_OPTIMIZATION (savings opportunities)  
     - NEW_FEATURES (relevant updates)
     - GENERAL (other updates)
+
+    With --sql the digest lists action-required and high-impact items and
+    per-level counts straight from the database instead.
     
     Example:
         python main.py send-smart-digest --days 7 --channels slack
         python main.py send-smart-digest --days 14 --engine openai --model gpt-4
+        python main.py send-smart-digest --days 7 --sql
     """
     logger.info(f"Generating smart digest for last {days} days...")
     typer.echo(f"🔍 Analyzing AWS updates from the last {days} days...")
-    
-    # 1. Get items from database
-    items = _get_recent_items(days)
-    
-    if not items:
-        typer.echo(f"No items found in the last {days} days.")
-        logger.info("No items to process for smart digest.")
-        return
-    
-    typer.echo(f"📊 Found {len(items)} items. Generating AI-powered analysis...")
-    
-    # 2. Generate smart digest using AI
-    target_model = model or settings.DEFAULT_AI_MODEL
-    smart_digest = _generate_smart_digest(items, engine, target_model, days)
+
+    if sql:
+        smart_digest = _generate_sql_digest(days)
+        if smart_digest is None:
+            typer.echo(f"No items found in the last {days} days.")
+            return
+    else:
+        # 1. Get items from database
+        items = _get_recent_items(days)
+        
+        if not items:
+            typer.echo(f"No items found in the last {days} days.")
+            logger.info("No items to process for smart digest.")
+            return
+        
+        typer.echo(f"📊 Found {len(items)} items. Generating AI-powered analysis...")
+        
+        # 2. Generate smart digest using AI
+        target_model = model or settings.DEFAULT_AI_MODEL
+        smart_digest = _generate_smart_digest(items, engine, target_model, days)
+        token_usage.log_summary()
     
     # 3. Send via notifiers
     notifiers = NotificationFactory.get_notifiers(channels.split(","))
@@ -678,7 +1126,9 @@ def export(
     format: str = typer.Option("json", help="Export format: json, csv, markdown, txt"),
     output: str = typer.Option("export", help="Output filename (without extension)"),
     days: int = typer.Option(7, help="Export items from last N days"),
-    filter_tags: str = typer.Option(None, help="Filter by tags (comma-separated)")
+    filter_tags: str = typer.Option(None, help="Filter by tags (comma-separated)"),
+    impact: Optional[str] = typer.Option(None, help="Only items with these impact levels (comma-separated, e.g. CRITICAL,HIGH)"),
+    action_required: bool = typer.Option(False, "--action-required", help="Only items whose summary requires an action")
 ):
     """
     Export news items to various formats (JSON, CSV, Markdown, TXT).
@@ -698,6 +1148,7 @@ def export(
             from sqlalchemy import or_
             tag_filters = [NewsItem.tags.like(f"%{tag}%") for tag in tags_list]
             query = query.filter(or_(*tag_filters))
+        query = _filter_summary_fields(query, impact, action_required)
         
         items = query.order_by(NewsItem.published_at.desc()).all()
         
@@ -715,6 +1166,9 @@ def export(
                     "url": item.url,
                     "content": item.content,
                     "summary": item.summary,
+                    "summary_provider": item.summary_provider,
+                    "impact_level": item.impact_level,
+                    "action_required": item.action_required,
                     "published_at": item.published_at.isoformat(),
                     "created_at": item.created_at.isoformat(),
                     "tags": item.tags,
@@ -728,13 +1182,15 @@ def export(
         elif format == "csv":
             with open(filename, "w", newline="", encoding="utf-8") as f:
                 writer = csv.writer(f)
-                writer.writerow(["ID", "Title", "URL", "Summary", "Published At", "Tags", "Notified"])
+                writer.writerow(["ID", "Title", "URL", "Summary", "Impact Level", "Action Required", "Published At", "Tags", "Notified"])
                 for item in items:
                     writer.writerow([
                         item.id,
                         item.title,
                         item.url,
                         item.summary or "",
+                        item.impact_level or "",
+                        "" if item.action_required is None else ("Yes" if item.action_required else "No"),
                         item.published_at.isoformat(),
                         item.tags or "",
                         "Yes" if item.is_notified else "No"
@@ -752,6 +1208,8 @@ def export(
                     f.write(f"## {item.title}\n\n")
                     f.write(f"**Published**: {item.published_at.strftime('%Y-%m-%d %H:%M')} UTC\n")
                     f.write(f"**Tags**: {item.tags or 'None'}\n")
+                    if item.impact_level:
+                        f.write(f"**Impact**: {item.impact_level}{' (action required)' if item.action_required else ''}\n")
                     f.write(f"**Notified**: {'Yes' if item.is_notified else 'No'}\n\n")
                     if item.summary:
                         f.write(f"### Summary\n\n{item.summary}\n\n")
@@ -770,6 +1228,8 @@ def export(
                     f.write(f"{i}. {item.title}\n")
                     f.write(f"   Published: {item.published_at.strftime('%Y-%m-%d %H:%M')} UTC\n")
                     f.write(f"   Tags: {item.tags or 'None'}\n")
+                    if item.impact_level:
+                        f.write(f"   Impact: {item.impact_level}{' (action required)' if item.action_required else ''}\n")
                     f.write(f"   Notified: {'Yes' if item.is_notified else 'No'}\n")
                     if item.summary:
                         summary_lines = item.summary.split("\n")
@@ -826,6 +1286,10 @@ def cleanup(
             db.commit()
             typer.echo(f"✅ Deleted {len(old_items)} items older than {days} days")
             
+            evicted = summary_cache.evict()
+            if evicted:
+                typer.echo(f"✅ Evicted {evicted} cached summaries")
+            
             # Vacuum database to reclaim space
             try:
                 db.execute(text("VACUUM"))
@@ -839,3 +1303,29 @@ def cleanup(
         typer.echo(f"❌ Cleanup failed: {e}", err=True)
         raise typer.Exit(1)
 
+
+@app.command()
+def serve_transformers(
+    model: str = typer.Option(
+        settings.DEFAULT_AI_MODEL if settings.DEFAULT_AI_ENGINE == "transformers" else "facebook/bart-large-cnn",
+        help="HuggingFace summarization model to serve"
+    ),
+    host: Optional[str] = typer.Option(None, help="Bind address (default: host of TRANSFORMERS_SERVER_URL)"),
+    port: Optional[int] = typer.Option(None, help="Port (default: port of TRANSFORMERS_SERVER_URL)")
+):
+    """
+    Run the local transformers inference worker.
+
+    Loads the model once and serves summaries to the `transformers` engine,
+    so cycles started by the daemon do not reload the model every time.
+
+    Example:
+        python main.py serve-transformers --model facebook/bart-large-cnn
+    """
+    from src.engines.transformers_server import serve
+
+    serve(model, host, port)
+
+
+if __name__ == "__main__":
+    app()
@@ -1,9 +1,11 @@
 from datetime import datetime
-from typing import Optional
-from sqlalchemy import create_engine, String, Text, DateTime, Column, Index, text
+from typing import Any, Dict, List, Optional
+from sqlalchemy import create_engine, insert, inspect, String, Text, DateTime, Column, Index, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker, Session
 from src.utils.config import settings
+from src.utils.prompts import parse_summary_fields
 import logging
+import threading
 import time
 
 logger = logging.getLogger(__name__)
@@ -23,6 +25,11 @@ class NewsItem(Base):
     url: Mapped[str] = mapped_column(String(2048))
     content: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Engine/model that actually produced the summary (may be a fallback provider)
+    summary_provider: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    # Parsed from the summary, so digests, filters and exports are plain SQL
+    impact_level: Mapped[Optional[str]] = mapped_column(String(16), nullable=True, index=True)
+    action_required: Mapped[Optional[bool]] = mapped_column(nullable=True, index=True)
     published_at: Mapped[datetime] = mapped_column(DateTime, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     tags: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
@@ -32,9 +39,63 @@ class NewsItem(Base):
         Index('idx_notified_published', 'is_notified', 'published_at'),
     )
 
+    def set_summary(self, summary: Optional[str], provider: Optional[str] = None) -> None:
+        """
+        Store a summary, the provider that produced it and the fields parsed from it.
+        """
+        fields = parse_summary_fields(summary)
+        self.summary = summary
+        self.summary_provider = getattr(summary, "provider", None) or provider
+        self.impact_level = fields["impact_level"]
+        self.action_required = fields["action_required"]
+
     def __repr__(self) -> str:
         return f"<NewsItem(id={self.id}, title='{self.title[:30]}...')>"
 
+class FeedState(Base):
+    """
+    Model storing per-feed HTTP cache validators (ETag / Last-Modified / body hash).
+    Used to issue conditional GET requests and skip unchanged feeds.
+    """
+    __tablename__ = "feed_states"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    url: Mapped[str] = mapped_column(String(2048), unique=True, index=True)
+    etag: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    last_modified: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    body_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    last_changed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # High-water mark: newest entry stored from this feed
+    last_source_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    last_published_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # Adaptive polling schedule
+    last_polled_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    poll_interval: Mapped[Optional[int]] = mapped_column(nullable=True)
+    next_poll_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<FeedState(url='{self.url}', etag='{self.etag}')>"
+
+class CachedSummary(Base):
+    """
+    Model storing AI summaries keyed by a hash of the normalized input text,
+    engine, model, language and prompt version (see src/core/summary_cache.py).
+    """
+    __tablename__ = "summary_cache"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    key: Mapped[str] = mapped_column(String(64), unique=True, index=True)
+    engine: Mapped[str] = mapped_column(String(64))
+    model: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    summary: Mapped[str] = mapped_column(Text)
+    provider: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    hits: Mapped[int] = mapped_column(default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    last_used_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self) -> str:
+        return f"<CachedSummary(key='{self.key[:12]}', engine='{self.engine}', model='{self.model}')>"
+
 class DBManager:
     """
     Singleton class to manage Database connection and sessions.
@@ -42,6 +103,7 @@ class DBManager:
     _instance = None
     _engine = None
     _SessionLocal = None
+    _init_lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
@@ -71,15 +133,37 @@ class DBManager:
                 conn.execute(text("PRAGMA busy_timeout=5000"))  # 5s timeout
                 logger.info("SQLite WAL mode enabled for concurrent access")
         
-        self._SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self._engine)
         Base.metadata.create_all(bind=self._engine)
+        self._migrate_schema()
+        # Published last: other threads only use the database once the schema exists
+        self._SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self._engine)
+
+    def _migrate_schema(self):
+        """
+        Add columns and indexes introduced after a table was first created.
+        `create_all` only creates missing tables, it never alters existing ones.
+        """
+        inspector = inspect(self._engine)
+        with self._engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                existing = {column["name"] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name in existing:
+                        continue
+                    column_type = column.type.compile(dialect=self._engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                    logger.info(f"Added column {table.name}.{column.name}")
+                for index in table.indexes:
+                    index.create(conn, checkfirst=True)
 
     def get_session(self) -> Session:
         """
         Get a new database session with retry logic for locked database.
         """
         if not self._SessionLocal:
-            self._init_db()
+            with self._init_lock:
+                if not self._SessionLocal:
+                    self._init_db()
         
         max_retries = 3
         for attempt in range(max_retries):
@@ -93,4 +177,75 @@ class DBManager:
                 else:
                     raise
 
+    def begin_write(self, session: Session) -> None:
+        """
+        Start an explicit write transaction on the given session.
+
+        The SQLite driver runs with isolation_level=None (autocommit), so without
+        an explicit BEGIN every statement would commit (and fsync) on its own.
+        """
+        if session.get_bind().dialect.name == "sqlite":
+            session.execute(text("BEGIN IMMEDIATE"))
+
 db_manager = DBManager()
+
+def insert_news_items(session: Session, rows: List[Dict[str, Any]]) -> int:
+    """
+    Bulk insert news items, skipping rows whose source_id already exists.
+
+    Uses `INSERT ... ON CONFLICT DO NOTHING` on SQLite and PostgreSQL so a
+    concurrent scan cannot fail the batch; other dialects use a plain insert.
+
+    Returns:
+        Number of rows actually inserted
+    """
+    if not rows:
+        return 0
+    
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        dialect_insert = None
+    
+    # Core insert on the table: the ORM bulk path does not report a rowcount
+    table = NewsItem.__table__
+    if dialect_insert:
+        stmt = dialect_insert(table).on_conflict_do_nothing(index_elements=["source_id"])
+    else:
+        stmt = insert(table)
+    return session.execute(stmt, rows).rowcount
+
+def backfill_summary_fields(session: Session, batch_size: int = 500) -> int:
+    """
+    Parse impact level and action flag for summaries stored before those columns existed.
+
+    Returns:
+        Number of items updated
+    """
+    updated, last_id = 0, 0
+    while True:
+        items = (
+            session.query(NewsItem)
+            .filter(
+                NewsItem.id > last_id,
+                NewsItem.summary.isnot(None),
+                NewsItem.impact_level.is_(None),
+                NewsItem.action_required.is_(None)
+            )
+            .order_by(NewsItem.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not items:
+            return updated
+        for item in items:
+            fields = parse_summary_fields(item.summary)
+            if fields["impact_level"] or fields["action_required"] is not None:
+                item.impact_level = fields["impact_level"]
+                item.action_required = fields["action_required"]
+                updated += 1
+        last_id = items[-1].id
+        session.commit()
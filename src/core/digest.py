@@ -0,0 +1,129 @@
+"""
+Map-reduce digest generation.
+
+A digest that fits the model's context window is generated with one call.
+Larger periods are split into chunks per category, each chunk is condensed in
+parallel (map), and the condensed notes are combined into the final digest
+(reduce), condensing again if the notes themselves are still too large. Every
+call goes through the summary cache, so regenerating a digest only pays for
+chunks whose items changed. Digest calls are always answered as free text,
+also with STRUCTURED_OUTPUT.
+"""
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from src.core.summary_cache import summary_cache
+from src.engines.base import free_text
+from src.utils.config import settings
+from src.utils.prompts import get_digest_map_prompt, get_summarize_prompt, get_system_prompt
+from src.utils.tokens import TokenCounter, fit_items, get_model_limits, input_budget
+
+logger = logging.getLogger(__name__)
+
+
+class DigestPipeline:
+    """
+    Builds a digest from (group, text) entries with a hierarchical map-reduce.
+
+    Args:
+        engine: AI engine name
+        model: Model name
+        workers: Chunks condensed in parallel
+    """
+    MAX_LEVELS = 4
+    # Output tokens reserved per condensed note line
+    NOTE_TOKENS = 40
+
+    def __init__(self, engine: str, model: Optional[str], workers: int = settings.SUMMARY_WORKERS):
+        self.engine = engine
+        self.model = model
+        self.workers = max(1, workers)
+        self.counter = TokenCounter(model)
+
+    def _budget(self, build_prompt: Callable[[str], str]) -> int:
+        # Digest prompts are sent through `summarize`, which wraps them in the engine prompts
+        overhead = get_system_prompt() + get_summarize_prompt(build_prompt(""))
+        return input_budget(self.model, self.counter, overhead, engine=self.engine)
+
+    def _size(self, texts: List[str]) -> int:
+        return sum(self.counter.count(text) + 1 for text in texts)
+
+    def _chunks(self, entries: List[Tuple[str, str]], budget: int) -> List[Tuple[str, List[str]]]:
+        """
+        Split entries into chunks of one group each, at most `budget` tokens
+        per chunk and no more items than the model can answer with notes.
+        """
+        _, max_output = get_model_limits(self.model, self.engine)
+        max_items = max(1, max_output // self.NOTE_TOKENS)
+
+        groups = {}
+        for group, text in entries:
+            groups.setdefault(group, []).append(self.counter.truncate(text, budget))
+
+        chunks = []
+        for group, texts in groups.items():
+            current, used = [], 0
+            for text in texts:
+                size = self.counter.count(text) + 1
+                if current and (used + size > budget or len(current) == max_items):
+                    chunks.append((group, current))
+                    current, used = [], 0
+                current.append(text)
+                used += size
+            if current:
+                chunks.append((group, current))
+        return chunks
+
+    def _condense(self, chunk: Tuple[str, List[str]]) -> str:
+        group, texts = chunk
+        prompt = get_digest_map_prompt(group, "\n".join(texts))
+        return f"[{group}]\n{summary_cache.summarize(prompt, self.engine, self.model).strip()}"
+
+    def _map(self, entries: List[Tuple[str, str]]) -> List[str]:
+        budget = self._budget(lambda content: get_digest_map_prompt("", content))
+        chunks = self._chunks(entries, budget)
+        logger.info(f"Condensing {len(entries)} digest entries in {len(chunks)} chunks...")
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(chunks))) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, self._condense, chunk) for chunk in chunks]
+            return [future.result() for future in futures]
+
+    def run(self, entries: List[Tuple[str, str]], build_prompt: Callable[[str], str]) -> str:
+        """
+        Generate the digest.
+
+        Args:
+            entries: (group, text) pairs in priority order (e.g. newest first)
+            build_prompt: Builds the final digest prompt around the content
+
+        Returns:
+            Digest text
+        """
+        with free_text():
+            return self._run(entries, build_prompt)
+
+    def _run(self, entries: List[Tuple[str, str]], build_prompt: Callable[[str], str]) -> str:
+        budget = self._budget(build_prompt)
+        texts = [text for _, text in entries]
+
+        level = 0
+        while self._size(texts) > budget and level < self.MAX_LEVELS:
+            previous = self._size(texts)
+            level += 1
+            if level == 1:
+                texts = self._map(entries)
+            else:
+                texts = self._map([("Digest notes", text) for text in texts])
+            logger.info(f"Digest level {level}: {previous} -> {self._size(texts)} tokens (budget {budget})")
+            if self._size(texts) >= previous:
+                break
+
+        fitted, dropped = fit_items(texts, budget, self.counter)
+        if dropped:
+            # Leave room for telling the model that the digest is incomplete
+            fitted, dropped = fit_items(texts, budget - self.NOTE_TOKENS, self.counter)
+            logger.warning(f"{dropped} digest sections did not fit into {self.model}'s context window")
+            fitted.append(f"- (+{dropped} older sections omitted to fit the model's context window)")
+        texts = fitted
+        return summary_cache.summarize(build_prompt("\n".join(texts) + "\n"), self.engine, self.model)
@@ -0,0 +1,126 @@
+"""
+Offline record/replay of feed responses.
+
+In "record" mode every successful feed response is written to a fixture
+directory. In "replay" mode FeedScraper serves responses from that directory
+instead of the network, with an optional simulated latency, so scans can be
+benchmarked and compared without hitting aws.amazon.com.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class FeedFixtures:
+    """
+    Fixture store for feed bodies, keyed by URL.
+
+    Each URL maps to `<sha1>.body` (raw bytes) and `<sha1>.json` (URL, status
+    and cache headers). `index.json` lists all recorded URLs for humans.
+    """
+    MODES = ("off", "record", "replay")
+    RECORDED_HEADERS = ("ETag", "Last-Modified", "Content-Type")
+
+    def __init__(self, directory: str, mode: str = "off", latency_ms: float = 0):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown fixture mode: {mode}. Use one of {self.MODES}")
+        self.directory = directory
+        self.mode = mode
+        self.latency = latency_ms / 1000.0
+        self._lock = threading.Lock()
+
+    def _path(self, url: str, suffix: str) -> str:
+        key = hashlib.sha1(url.encode()).hexdigest()
+        return os.path.join(self.directory, f"{key}{suffix}")
+
+    def write(self, url: str, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+        """
+        Store a feed body and its cache headers.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        meta = {
+            "url": url,
+            "headers": {k: v for k, v in (headers or {}).items() if k in self.RECORDED_HEADERS}
+        }
+        with open(self._path(url, ".body"), "wb") as f:
+            f.write(body)
+        with open(self._path(url, ".json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+        with self._lock:
+            index_path = os.path.join(self.directory, "index.json")
+            index = {}
+            if os.path.exists(index_path):
+                with open(index_path, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+            index[url] = os.path.basename(self._path(url, ".body"))
+            with open(index_path, "w", encoding="utf-8") as f:
+                json.dump(index, f, indent=2, sort_keys=True)
+
+    def record(self, url: str, response: requests.Response) -> None:
+        """
+        Store a live response (304 responses carry no body and are not stored).
+        """
+        if response.status_code != 200:
+            return
+        self.write(url, response.content, dict(response.headers))
+        logger.debug(f"Recorded fixture for {url}")
+
+    def replay(self, url: str, request_headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        Serve a recorded response, answering 304 when the request's
+        If-None-Match / If-Modified-Since matches the recorded headers.
+
+        Raises:
+            requests.ConnectionError: If no fixture was recorded for the URL
+        """
+        if self.latency:
+            time.sleep(self.latency)
+
+        body_path = self._path(url, ".body")
+        if not os.path.exists(body_path):
+            raise requests.ConnectionError(f"No recorded fixture for {url} in {self.directory}")
+
+        with open(self._path(url, ".json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        headers = CaseInsensitiveDict(meta.get("headers", {}))
+        request_headers = request_headers or {}
+
+        response = requests.Response()
+        response.url = url
+        response.headers = headers
+        response.encoding = "utf-8"
+
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if (etag and request_headers.get("If-None-Match") == etag) or (
+            last_modified and request_headers.get("If-Modified-Since") == last_modified
+        ):
+            response.status_code = 304
+            response._content = b""
+            return response
+
+        response.status_code = 200
+        with open(body_path, "rb") as f:
+            response._content = f.read()
+        return response
+
+
+def get_feed_fixtures() -> Optional[FeedFixtures]:
+    """
+    Return the fixture store configured in settings, or None when disabled.
+    """
+    if settings.FEED_FIXTURE_MODE == "off":
+        return None
+    return FeedFixtures(settings.FEED_FIXTURE_DIR, settings.FEED_FIXTURE_MODE, settings.FEED_REPLAY_LATENCY_MS)
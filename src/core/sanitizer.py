@@ -0,0 +1,91 @@
+"""
+HTML sanitizers for feed titles and content.
+
+All engines return the same thing: visible text with dangerous elements
+(script, style, iframe, object, embed) removed and text nodes joined by a
+single space, matching BeautifulSoup's `get_text(separator=' ', strip=True)`.
+"""
+import logging
+import re
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+DANGEROUS_TAGS = ["script", "style", "iframe", "object", "embed"]
+
+# Full documents keep <head> text (e.g. <title>) in BeautifulSoup but not in
+# lxml's fragment parser, so they always take the BeautifulSoup path.
+_DOCUMENT_RE = re.compile(r"<(html|head)\b", re.IGNORECASE)
+
+# Inputs lxml reads differently: it drops CDATA sections, keeps <textarea>
+# markup as literal text and turns NUL bytes into U+FFFD
+_LXML_MISMATCH_RE = re.compile(r"<!\[CDATA\[|<textarea\b|\x00", re.IGNORECASE)
+
+
+def sanitize_html_bs4(html_text: str) -> str:
+    """
+    Reference sanitizer using BeautifulSoup's html.parser.
+    """
+    if not html_text:
+        return ""
+
+    soup = BeautifulSoup(html_text, "html.parser")
+
+    # Remove script and style elements
+    for element in soup(DANGEROUS_TAGS):
+        element.decompose()
+
+    return soup.get_text(separator=' ', strip=True)
+
+
+def sanitize_html_lxml(html_text: str) -> str:
+    """
+    Fast sanitizer using lxml's C parser.
+    """
+    if not html_text:
+        return ""
+
+    root = lxml.html.fragment_fromstring(html_text, create_parent="div")
+    for element in list(root.iter(*DANGEROUS_TAGS)):
+        # clear() instead of drop_tree() keeps the tail as a separate text node,
+        # so surrounding words are not glued together
+        element.clear(keep_tail=True)
+
+    return ' '.join(part.strip() for part in root.xpath("//text()") if part.strip())
+
+
+def sanitize_html(html_text: str, engine: str = "auto") -> str:
+    """
+    Remove dangerous tags and attributes from HTML and return plain text.
+
+    Args:
+        html_text: Raw HTML (or plain text)
+        engine: 'auto' (lxml when installed), 'lxml' or 'bs4'
+
+    Returns:
+        Sanitized text
+    """
+    if not html_text:
+        return ""
+
+    # Nothing to parse: no tags and no entities
+    if "<" not in html_text and "&" not in html_text:
+        return html_text.strip()
+
+    if (
+        engine == "bs4" or lxml is None
+        or _DOCUMENT_RE.search(html_text) or _LXML_MISMATCH_RE.search(html_text)
+    ):
+        return sanitize_html_bs4(html_text)
+
+    try:
+        return sanitize_html_lxml(html_text)
+    except (ValueError, lxml.etree.ParserError) as e:
+        # e.g. control characters lxml refuses to parse
+        logger.debug(f"lxml sanitizer failed, falling back to BeautifulSoup: {e}")
+        return sanitize_html_bs4(html_text)
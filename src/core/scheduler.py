@@ -0,0 +1,117 @@
+"""
+Adaptive per-feed polling scheduler.
+
+Learns how often each feed publishes from the `published_at` history of its
+stored items and polls busy feeds often and quiet feeds rarely.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from src.core.database import FeedState, NewsItem
+from src.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class FeedScheduler:
+    """
+    Computes per-feed poll intervals and decides which feeds are due.
+
+    Interval = mean gap between the feed's recent publications (including the
+    current silence) * FEED_POLL_FACTOR, clamped to the configured bounds.
+    A feed's "priority" key in AWS_FEEDS overrides the learned interval:
+    "high" always polls at the minimum interval, "low" at the maximum.
+    """
+    HISTORY_SIZE = 20
+    HISTORY_DAYS = 180
+    # A feed counts as due slightly early so it is not pushed to the next tick by clock drift
+    DUE_GRACE = 0.1
+
+    def __init__(
+        self,
+        min_interval: int = settings.FEED_MIN_POLL_INTERVAL,
+        max_interval: int = settings.FEED_MAX_POLL_INTERVAL,
+        default_interval: int = settings.FEED_DEFAULT_POLL_INTERVAL,
+        factor: float = settings.FEED_POLL_FACTOR
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.default_interval = default_interval
+        self.factor = factor
+
+    def _clamp(self, seconds: float) -> int:
+        return int(min(self.max_interval, max(self.min_interval, seconds)))
+
+    def interval_for(self, target: Dict[str, Any], publish_times: List[datetime], now: Optional[datetime] = None) -> int:
+        """
+        Compute the poll interval (seconds) of a feed.
+
+        Args:
+            target: Feed definition (name, url, optional priority)
+            publish_times: Recent publish dates of the feed's items
+            now: Reference time (default: utcnow)
+
+        Returns:
+            Poll interval in seconds
+        """
+        priority = target.get("priority")
+        if priority == "high":
+            return self.min_interval
+        if priority == "low":
+            return self.max_interval
+
+        if len(publish_times) < 2:
+            return self._clamp(self.default_interval)
+
+        now = now or datetime.utcnow()
+        times = sorted(publish_times, reverse=True)[:self.HISTORY_SIZE]
+        # Span from the oldest item to now, so a feed that went quiet slows down
+        span = (max(now, times[0]) - times[-1]).total_seconds()
+        mean_gap = span / len(times)
+        return self._clamp(mean_gap * self.factor)
+
+    def is_due(self, state: Optional[FeedState], now: Optional[datetime] = None) -> bool:
+        """
+        Check whether a feed should be polled now. Never-polled feeds are always due.
+        """
+        if state is None or state.next_poll_at is None:
+            return True
+        now = now or datetime.utcnow()
+        grace = timedelta(seconds=(state.poll_interval or 0) * self.DUE_GRACE)
+        return now >= state.next_poll_at - grace
+
+    def publish_history(self, db: Session, targets: List[Dict[str, Any]]) -> Dict[str, List[datetime]]:
+        """
+        Load recent publish dates per feed name with a single query.
+
+        Items are attributed to feeds through their tags ("<Feed Name>" plus an
+        optional " [IGNORED]" / " [DIGEST]" suffix).
+        """
+        names = {target["name"] for target in targets}
+        history: Dict[str, List[datetime]] = {name: [] for name in names}
+        since = datetime.utcnow() - timedelta(days=self.HISTORY_DAYS)
+
+        rows = db.query(NewsItem.tags, NewsItem.published_at).filter(
+            NewsItem.published_at >= since
+        ).order_by(NewsItem.published_at.desc())
+
+        for tags, published_at in rows:
+            name = (tags or "").split(" [")[0]
+            if name in history and len(history[name]) < self.HISTORY_SIZE:
+                history[name].append(published_at)
+        return history
+
+    def record_poll(self, state: FeedState, interval: int, now: Optional[datetime] = None) -> None:
+        """
+        Store a successful poll and schedule the next one.
+        """
+        now = now or datetime.utcnow()
+        state.last_polled_at = now
+        state.poll_interval = interval
+        state.next_poll_at = now + timedelta(seconds=interval)
+
+
+feed_scheduler = FeedScheduler()
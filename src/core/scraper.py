@@ -1,17 +1,42 @@
+import hashlib
 import logging
 import feedparser
 import requests
 import random
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
+from src.core.replay import FeedFixtures, get_feed_fixtures
+from src.core.sanitizer import sanitize_html
 from src.utils.config import settings
-from datetime import datetime
+from src.utils.http import HttpClient, http_client
+from src.utils.ratelimit import HostRateLimiter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from time import mktime
 
 logger = logging.getLogger(__name__)
 
+host_rate_limiter = HostRateLimiter(settings.SCRAPER_RATE_PER_HOST, settings.SCRAPER_BURST)
+
+_process_scraper = None
+
+def parse_feed_records(
+    content: str,
+    last_source_id: Optional[str] = None,
+    last_published_at: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Process-pool entry point for FeedScraper.parse_feed.
+
+    Runs in a worker process and returns only plain, picklable records
+    (dicts of str/datetime), never feedparser objects.
+    """
+    global _process_scraper
+    if _process_scraper is None:
+        _process_scraper = FeedScraper()
+    return _process_scraper.parse_feed(content, last_source_id, last_published_at)
+
 class FeedScraper:
     """
     Secure RSS/Atom Feed Scraper with SSRF protection and retry logic.
@@ -25,10 +50,21 @@ class FeedScraper:
     TIMEOUT = 30
     ALLOWED_DOMAINS = ["aws.amazon.com", "amazon.com"]
     MAX_RETRIES = 3
+    RETRY_AFTER_STATUSES = (429, 503)
+    MAX_RETRY_AFTER = 120
 
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": random.choice(self.USER_AGENTS)})
+    def __init__(
+        self,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        client: Optional[HttpClient] = None,
+        fixtures: Optional[FeedFixtures] = None
+    ):
+        # Both are shared across scrapers so worker threads reuse pooled connections
+        # and respect the same per-host budget
+        self.client = client or http_client
+        self.rate_limiter = rate_limiter or host_rate_limiter
+        # Offline record/replay (FEED_FIXTURE_MODE), None when disabled
+        self.fixtures = fixtures or get_feed_fixtures()
 
     def _validate_url(self, url: str) -> bool:
         """Validate URL against whitelist to prevent SSRF attacks."""
@@ -44,27 +80,110 @@ class FeedScraper:
         """
         Fetch feed content with URL validation and retry logic.
         """
+        response = self._request(url)
+        return response.text
+
+    def fetch_conditional(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        body_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch feed content using HTTP cache validators.
+
+        Sends If-None-Match / If-Modified-Since when validators are known and
+        compares the body hash so unchanged feeds can be skipped entirely.
+
+        Args:
+            url: Feed URL to fetch
+            etag: ETag returned by the previous successful fetch
+            last_modified: Last-Modified returned by the previous successful fetch
+            body_hash: SHA-256 of the previous response body
+
+        Returns:
+            Dictionary with 'modified', 'content', 'etag', 'last_modified' and 'body_hash'.
+            'content' is None when the feed did not change; the validators are
+            always the latest ones, which callers should store either way.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        response = self._request(url, headers=headers)
+
+        if response.status_code == 304:
+            logger.info(f"Feed not modified (304): {url}")
+            return {
+                "modified": False,
+                "content": None,
+                "etag": etag,
+                "last_modified": last_modified,
+                "body_hash": body_hash
+            }
+
+        new_hash = hashlib.sha256(response.content).hexdigest()
+        result = {
+            "modified": new_hash != body_hash,
+            "content": response.text,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "body_hash": new_hash
+        }
+        if not result["modified"]:
+            logger.info(f"Feed body unchanged: {url}")
+            result["content"] = None
+        return result
+
+    def _request(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        Perform a GET request with URL validation, per-host rate limiting and retry logic.
+        """
         if not self._validate_url(url):
             raise ValueError(f"URL not in whitelist: {url}")
         
+        if self.fixtures and self.fixtures.mode == "replay":
+            logger.info(f"Replaying feed: {url}")
+            return self.fixtures.replay(url, headers)
+        
+        host = urlparse(url).netloc.lower()
         last_exception = None
         for attempt in range(self.MAX_RETRIES):
+            deferred = False
             try:
-                ua = random.choice(self.USER_AGENTS)
-                self.session.headers.update({"User-Agent": ua})
+                request_headers = {"User-Agent": random.choice(self.USER_AGENTS)}
+                request_headers.update(headers or {})
                 
-                sleep_time = random.uniform(1.5, 4.0)
-                logger.debug(f"Sleeping {sleep_time:.2f}s before fetching {url}...")
-                time.sleep(sleep_time)
+                waited = self.rate_limiter.acquire(host)
+                if waited:
+                    logger.debug(f"Rate limited {waited:.2f}s before fetching {url}...")
 
                 logger.info(f"Fetching feed: {url}")
-                response = self.session.get(url, timeout=self.TIMEOUT)
+                response = self.client.get(url, headers=request_headers, timeout=self.TIMEOUT)
+                
+                if response.status_code in self.RETRY_AFTER_STATUSES:
+                    retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+                    if retry_after is not None:
+                        retry_after = min(retry_after, self.MAX_RETRY_AFTER)
+                        logger.warning(f"{host} answered {response.status_code}, pausing host for {retry_after:.0f}s")
+                        self.rate_limiter.defer(host, retry_after)
+                        deferred = True
+                
                 response.raise_for_status()
-                return response.text
+                if self.fixtures and self.fixtures.mode == "record":
+                    self.fixtures.record(url, response)
+                return response
                 
             except requests.RequestException as e:
                 last_exception = e
                 if attempt < self.MAX_RETRIES - 1:
+                    if deferred:
+                        # The rate limiter already delays the next attempt
+                        logger.warning(f"Fetch failed (attempt {attempt + 1}/{self.MAX_RETRIES}), retrying after Retry-After: {e}")
+                        continue
                     wait_time = 2 ** attempt
                     logger.warning(f"Fetch failed (attempt {attempt + 1}/{self.MAX_RETRIES}), retrying in {wait_time}s: {e}")
                     time.sleep(wait_time)
@@ -73,10 +192,50 @@ class FeedScraper:
         
         raise last_exception
 
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        Parse a Retry-After header (delta-seconds or HTTP-date) into seconds.
+        """
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
     def parse(self, content: str) -> List[Dict[str, Any]]:
         """
         Parse raw feed content and return a list of simplified items.
         """
+        return self.parse_feed(content)["items"]
+
+    def parse_feed(
+        self,
+        content: str,
+        last_source_id: Optional[str] = None,
+        last_published_at: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Parse raw feed content incrementally.
+
+        Feeds list newest entries first, so parsing stops at the first entry
+        matching the feed's high-water mark. Entries behind it are never
+        sanitized.
+
+        Args:
+            content: Raw feed content
+            last_source_id: source_id of the newest entry seen on the previous scan
+            last_published_at: Newest publish date seen on the previous scan
+
+        Returns:
+            Dictionary with 'items' (new entries only) and the updated
+            'last_source_id' / 'last_published_at' (None when nothing new was found).
+        """
         feed = feedparser.parse(content)
         
         if feed.bozo:
@@ -88,13 +247,44 @@ class FeedScraper:
                  logger.debug(f"Feed parsing warning (benign): {feed.bozo_exception}")
 
         items = []
+        newest_published = None
         for entry in feed.entries:
+            guid = self._entry_id(entry)
+            published_at = self._entry_published(entry)
+            
+            if last_source_id and guid == last_source_id:
+                break
+            if last_published_at and published_at and published_at < last_published_at:
+                break
+            
             item = self._process_entry(entry)
             if item:
                 items.append(item)
+                if published_at and (newest_published is None or published_at > newest_published):
+                    newest_published = published_at
         
-        logger.info(f"Parsed {len(items)} items from feed.")
-        return items
+        skipped = len(feed.entries) - len(items)
+        if skipped and (last_source_id or last_published_at):
+            logger.info(f"Parsed {len(items)} new items from feed ({skipped} known entries skipped).")
+        else:
+            logger.info(f"Parsed {len(items)} items from feed.")
+        return {
+            "items": items,
+            "last_source_id": items[0]["source_id"] if items else None,
+            "last_published_at": newest_published
+        }
+
+    @staticmethod
+    def _entry_id(entry: Any) -> str:
+        link = entry.get("link", "")
+        return entry.get("id", link)
+
+    @staticmethod
+    def _entry_published(entry: Any) -> Optional[datetime]:
+        published_struct = entry.get("published_parsed", entry.get("updated_parsed"))
+        if published_struct:
+            return datetime.fromtimestamp(mktime(published_struct))
+        return None
 
     def _process_entry(self, entry: Any) -> Dict[str, Any]:
         """
@@ -104,7 +294,7 @@ class FeedScraper:
             # Extract basic fields
             title = self._sanitize_html(entry.get("title", "No Title"))
             link = entry.get("link", "")
-            guid = entry.get("id", link)
+            guid = self._entry_id(entry)
             
             # Extract content: prefer 'content', then 'summary', then 'description'
             content_raw = ""
@@ -118,11 +308,7 @@ class FeedScraper:
             content_clean = self._sanitize_html(content_raw)
 
             # Date handling
-            published_struct = entry.get("published_parsed", entry.get("updated_parsed"))
-            if published_struct:
-                published_at = datetime.fromtimestamp(mktime(published_struct))
-            else:
-                published_at = datetime.utcnow()
+            published_at = self._entry_published(entry) or datetime.utcnow()
 
             return {
                 "source_id": guid,
@@ -138,21 +324,6 @@ class FeedScraper:
     def _sanitize_html(self, html_text: str) -> str:
         """
         Remove dangerous tags and attributes from HTML.
-        Uses BeautifulSoup.
+        Returns plain text as it's easier for LLM to summarize.
         """
-        if not html_text:
-             return ""
-        
-        soup = BeautifulSoup(html_text, "html.parser")
-        
-        # Remove script and style elements
-        for script in soup(["script", "style", "iframe", "object", "embed"]):
-            script.decompose()
-
-        # Get text only (simple version) or minimal safe HTML.
-        # For now, let's keep it safe by returning text, 
-        # or simplified HTML if needed. The constraint mentioned 'Secure Parsing'.
-        # Returning get_text() is safest, but might lose formatting.
-        # Let's return text for now as it's easier for LLM to summarize.
-        
-        return soup.get_text(separator=' ', strip=True)
+        return sanitize_html(html_text, settings.SANITIZER_ENGINE)
@@ -0,0 +1,222 @@
+"""
+Persistent, content-addressed cache for AI summaries.
+
+The same announcement is often published in several feeds (e.g. "What's New"
+and a service blog), and digests are regenerated from the same items. Keying
+summaries by the normalized input text plus everything that changes the output
+(engine, model, SUMMARY_LANGUAGE, PROMPT_VERSION) lets every copy after the
+first skip the LLM call entirely.
+"""
+import hashlib
+import logging
+import re
+import unicodedata
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from src.core.database import CachedSummary, db_manager
+from src.engines.base import BaseEngine, Summary
+from src.engines.hedged import get_hedged_engine
+from src.engines.resilient import ResilientEngine
+from src.utils.config import settings
+from src.utils.prompts import PROMPT_VERSION
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class SummaryCache:
+    """
+    Summary cache backed by the `summary_cache` table.
+
+    Entries are evicted by age (last use older than SUMMARY_CACHE_MAX_AGE_DAYS)
+    and size (least recently used beyond SUMMARY_CACHE_MAX_ENTRIES).
+    """
+    def __init__(
+        self,
+        enabled: bool = settings.SUMMARY_CACHE_ENABLED,
+        max_entries: int = settings.SUMMARY_CACHE_MAX_ENTRIES,
+        max_age_days: int = settings.SUMMARY_CACHE_MAX_AGE_DAYS
+    ):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        Normalize text so trivially different copies of an item share a key.
+        """
+        text = unicodedata.normalize("NFKC", text or "")
+        return _WHITESPACE.sub(" ", text).strip()
+
+    def key_for(self, text: str, engine: str, model: Optional[str]) -> str:
+        """
+        Build the cache key for an input text and engine configuration.
+        """
+        parts = [
+            PROMPT_VERSION,
+            engine.lower(),
+            model or "",
+            settings.SUMMARY_LANGUAGE,
+            self.normalize(text)
+        ]
+        return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the cached summary for a key (as a `Summary` carrying the
+        provider that produced it), or None on a miss.
+        """
+        if not self.enabled:
+            return None
+        db = db_manager.get_session()
+        try:
+            entry = db.query(CachedSummary).filter(CachedSummary.key == key).first()
+            if entry is None:
+                return None
+            entry.hits += 1
+            entry.last_used_at = datetime.utcnow()
+            db.commit()
+            return Summary(entry.summary, entry.provider)
+        except Exception as e:
+            logger.warning(f"Summary cache lookup failed: {e}")
+            db.rollback()
+            return None
+        finally:
+            db.close()
+
+    def put(self, key: str, summary: str, engine: str, model: Optional[str]) -> None:
+        """
+        Store a summary. Empty summaries are never cached, and neither are
+        summaries from a fallback or hedge provider: the key names the
+        requested engine/model, so the next run asks that one again.
+        """
+        if not self.enabled or not summary:
+            return
+        provider = getattr(summary, "provider", None)
+        if provider and provider != ResilientEngine.provider_name(engine.lower(), model):
+            logger.info(f"Not caching summary from {provider} under {engine}/{model}")
+            return
+        db = db_manager.get_session()
+        try:
+            entry = db.query(CachedSummary).filter(CachedSummary.key == key).first()
+            now = datetime.utcnow()
+            if entry is None:
+                db.add(CachedSummary(
+                    key=key,
+                    engine=engine.lower(),
+                    model=model,
+                    summary=summary,
+                    provider=provider,
+                    created_at=now,
+                    last_used_at=now
+                ))
+            else:
+                entry.summary = summary
+                entry.provider = provider
+                entry.last_used_at = now
+            db.commit()
+        except Exception as e:
+            # A concurrent writer may have stored the same key first, which is fine
+            logger.warning(f"Summary cache store failed: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def summarize(self, text: str, engine: str, model: Optional[str], ai_engine: Optional[BaseEngine] = None) -> str:
+        """
+        Return the cached summary of `text`, calling the AI engine only on a miss.
+
+        Args:
+            text: Text passed to `summarize` of the engine
+            engine: Engine name (part of the cache key)
+            model: Model name (part of the cache key)
+            ai_engine: Engine instance to use on a miss (default: a
+                ResilientEngine with retries and the AI_FALLBACK_ENGINES chain,
+                hedged against AI_HEDGE_ENGINE when configured; engines are
+                only loaded on a miss)
+
+        Returns:
+            Summary string
+        """
+        key = self.key_for(text, engine, model)
+        cached = self.get(key)
+        if cached is not None:
+            logger.info(f"Summary cache hit ({engine}/{model})")
+            return cached
+
+        if ai_engine is None:
+            ai_engine = get_hedged_engine(engine, model)
+        summary = ai_engine.summarize(text)
+        self.put(key, summary, engine, model)
+        return summary
+
+    def summarize_batch(
+        self,
+        texts: List[str],
+        engine: str,
+        model: Optional[str],
+        ai_engine: Optional[BaseEngine] = None
+    ) -> List[str]:
+        """
+        Batch variant of `summarize`: cached texts are answered from the cache
+        and all misses go to the engine's `summarize_batch` in one call.
+
+        Returns:
+            One summary per text, in input order
+        """
+        keys = [self.key_for(text, engine, model) for text in texts]
+        results = [self.get(key) for key in keys]
+        misses = [i for i, cached in enumerate(results) if cached is None]
+        if len(misses) < len(texts):
+            logger.info(f"Summary cache hits: {len(texts) - len(misses)}/{len(texts)} ({engine}/{model})")
+        if not misses:
+            return results
+
+        if ai_engine is None:
+            ai_engine = get_hedged_engine(engine, model)
+        summaries = ai_engine.summarize_batch([texts[i] for i in misses])
+        for i, summary in zip(misses, summaries):
+            results[i] = summary
+            self.put(keys[i], summary, engine, model)
+        return results
+
+    def evict(self) -> int:
+        """
+        Delete expired entries and the least recently used ones beyond the size limit.
+
+        Returns:
+            Number of deleted entries
+        """
+        db = db_manager.get_session()
+        try:
+            db_manager.begin_write(db)
+            cutoff = datetime.utcnow() - timedelta(days=self.max_age_days)
+            deleted = db.query(CachedSummary).filter(
+                CachedSummary.last_used_at < cutoff
+            ).delete(synchronize_session=False)
+
+            overflow = db.query(CachedSummary).count() - self.max_entries
+            if overflow > 0:
+                stale_ids = db.query(CachedSummary.id).order_by(
+                    CachedSummary.last_used_at.asc()
+                ).limit(overflow).subquery()
+                deleted += db.query(CachedSummary).filter(
+                    CachedSummary.id.in_(stale_ids.select())
+                ).delete(synchronize_session=False)
+            db.commit()
+
+            if deleted:
+                logger.info(f"Evicted {deleted} cached summaries")
+            return deleted
+        except Exception as e:
+            logger.warning(f"Summary cache eviction failed: {e}")
+            db.rollback()
+            return 0
+        finally:
+            db.close()
+
+
+summary_cache = SummaryCache()
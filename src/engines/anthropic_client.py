@@ -1,18 +1,29 @@
+import json
 import logging
-from .base import BaseEngine
+from .base import PromptEngine
 from src.utils.config import settings
+from src.utils.prompts import split_cacheable_prefix
 
 logger = logging.getLogger(__name__)
 
 try:
-    from anthropic import Anthropic
+    from anthropic import Anthropic, AsyncAnthropic
 except ImportError:
     Anthropic = None
+    AsyncAnthropic = None
 
-class AnthropicEngine(BaseEngine):
+class AnthropicEngine(PromptEngine):
     """
     AI Engine for Anthropic (Claude) API.
+
+    The system prompt and the static summarize prefix are marked with
+    `cache_control`, so repeated requests read them from the prompt cache
+    (prefixes below the model's minimum cacheable length are not cached).
     """
+    PROVIDER = "Anthropic"
+    MAX_TOKENS_PER_ITEM = 1500
+    SUMMARY_TOOL = "record_summary"
+
     def __init__(self, model: str = "claude-3-5-sonnet-20241022"):
         if not Anthropic:
              raise ImportError("anthropic library not installed. Install with `pip install anthropic`")
@@ -22,33 +33,55 @@ class AnthropicEngine(BaseEngine):
              logger.warning("Anthropic API Key not found.")
         
         self.client = Anthropic(api_key=api_key)
+        self.async_client = AsyncAnthropic(api_key=api_key)
         self.model = model
 
-    def summarize(self, text: str) -> str:
-        try:
-            logger.info(f"Summarizing text with Anthropic model: {self.model}")
-            
-            # Use centralized prompts
-            from src.utils.prompts import get_system_prompt, get_summarize_prompt
-            
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=1500,
-                temperature=0,
-                system=get_system_prompt(),
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": get_summarize_prompt(text)
-                            }
-                        ]
-                    }
-                ]
-            )
-            return message.content[0].text
-        except Exception as e:
-            logger.error(f"Anthropic summarization failed: {e}")
-            raise
+    def _build_request(self, system: str, user: str, items: int, schema: dict = None) -> dict:
+        prefix, rest = split_cacheable_prefix(user)
+        content = []
+        if prefix:
+            # Breakpoint after the static part: system prompt + prefix are cached together
+            content.append({"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}})
+        content.append({"type": "text", "text": rest})
+        request = {
+            "model": self.model,
+            "max_tokens": self.MAX_TOKENS_PER_ITEM * items,
+            "temperature": 0,
+            "system": [{"type": "text", "text": system}],
+            "messages": [{"role": "user", "content": content}]
+        }
+        if schema:
+            # Forcing the tool makes the model answer with arguments matching the schema
+            request["tools"] = [{
+                "name": self.SUMMARY_TOOL,
+                "description": "Record the analysis of the AWS update(s).",
+                "input_schema": schema
+            }]
+            request["tool_choice"] = {"type": "tool", "name": self.SUMMARY_TOOL}
+        return request
+
+    @staticmethod
+    def _message_text(message) -> str:
+        for block in message.content:
+            if getattr(block, "type", None) == "tool_use":
+                return json.dumps(block.input)
+        return message.content[0].text
+
+    def _record_message_usage(self, message) -> None:
+        usage = getattr(message, "usage", None)
+        if usage is None:
+            return
+        cached = getattr(usage, "cache_read_input_tokens", None) or 0
+        written = getattr(usage, "cache_creation_input_tokens", None) or 0
+        # `input_tokens` only counts the tokens after the last cache breakpoint
+        self._record_usage(usage.input_tokens + cached + written, cached)
+
+    def _send(self, request: dict):
+        return self.client.messages.create(**request)
+
+    async def _asend(self, request: dict):
+        return await self.async_client.messages.create(**request)
+
+    def _parse_response(self, request: dict, message) -> str:
+        self._record_message_usage(message)
+        return self._message_text(message)
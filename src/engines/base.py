@@ -1,4 +1,50 @@
+import asyncio
+import contextvars
+import inspect
+import logging
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+from src.utils.config import settings
+from src.utils.ratelimit import SlidingWindowRateLimiter
+from src.utils.tokens import SUMMARY_OUTPUT_TOKENS, TokenCounter, get_model_limits, input_budget, token_usage
+
+logger = logging.getLogger(__name__)
+
+# Shared budget for AI requests across all engines and summarization workers
+ai_rate_limiter = SlidingWindowRateLimiter(settings.AI_RATE_LIMIT_CALLS, settings.AI_RATE_LIMIT_PERIOD)
+
+# Set while digest prompts (which reuse `summarize`) are answered: they stay free text
+_free_text = contextvars.ContextVar("free_text", default=False)
+
+@contextmanager
+def free_text():
+    """
+    Answer `summarize` calls in this context as free text, even with STRUCTURED_OUTPUT.
+    Worker threads started inside need a copy of the context (`contextvars.copy_context`).
+    """
+    token = _free_text.set(True)
+    try:
+        yield
+    finally:
+        _free_text.reset(token)
+
+def structured_output() -> bool:
+    """
+    Whether summaries are requested as JSON in the current context.
+    """
+    return settings.STRUCTURED_OUTPUT and not _free_text.get()
+
+class Summary(str):
+    """
+    Summary text that remembers which provider ("engine/model") produced it.
+    Behaves exactly like `str` everywhere else.
+    """
+    def __new__(cls, text: str, provider: Optional[str] = None):
+        summary = super().__new__(cls, text)
+        summary.provider = provider
+        return summary
 
 class BaseEngine(ABC):
     """
@@ -17,3 +63,285 @@ class BaseEngine(ABC):
             str: The summary.
         """
         pass
+
+    def summarize_batch(self, texts: List[str]) -> List[str]:
+        """
+        Summarize several texts. Engines that can process a batch in fewer
+        requests override this; the default summarizes one text at a time.
+
+        Args:
+            texts (List[str]): The texts to summarize.
+
+        Returns:
+            List[str]: One summary per text, in input order.
+        """
+        return [self.summarize(text) for text in texts]
+
+    async def asummarize(self, text: str) -> str:
+        """
+        Coroutine variant of `summarize`. Engines with an async SDK client
+        override it; the default runs `summarize` in a worker thread so the
+        event loop is never blocked.
+        
+        Args:
+            text (str): The text to summarize.
+            
+        Returns:
+            str: The summary.
+        """
+        return await asyncio.to_thread(self.summarize, text)
+
+    def close(self) -> None:
+        """
+        Release the resources held by the engine (SDK clients, loaded models).
+        Called by the engine pool when the instance is discarded.
+        """
+        client = getattr(self, "client", None)
+        if client is not None and hasattr(client, "close"):
+            client.close()
+
+    async def aclose(self) -> None:
+        """
+        Release the async SDK client, if the engine created one.
+        """
+        client = getattr(self, "async_client", None)
+        if client is not None and hasattr(client, "close"):
+            result = client.close()
+            if inspect.isawaitable(result):
+                await result
+
+class PromptEngine(BaseEngine):
+    """
+    Base class for LLM engines driven by the centralized prompts (API engines, Ollama).
+
+    Subclasses build the provider request (`_build_request`), make the SDK
+    call (`_send`, and `_asend` when the SDK has an async client) and read
+    the answer (`_parse_response`); `_generate`/`_agenerate` tie them
+    together. Every request counts against the shared AI rate limit, and
+    `summarize_batch` packs up to SUMMARY_BATCH_SIZE short texts into a
+    single request.
+
+    With STRUCTURED_OUTPUT the model answers in JSON (SUMMARY_SCHEMA), which
+    is rendered back to the usual Markdown. Subclasses pass `schema` to the
+    provider's JSON mode, schema or tool calling where it has one; otherwise
+    the prompt's instructions and the tolerant parser in prompts.py apply.
+    """
+    PROVIDER = "AI"
+    # Engine name for engine-specific model limits (see `get_model_limits`)
+    ENGINE: Optional[str] = None
+    # Output tokens requested per summary by engines that set an output limit
+    MAX_TOKENS_PER_ITEM = SUMMARY_OUTPUT_TOKENS
+
+    def _build_request(self, system: str, user: str, items: int, schema: Optional[dict]) -> dict:
+        """
+        Build the keyword arguments of the provider's SDK call for one prompt.
+
+        Args:
+            system (str): System prompt.
+            user (str): User prompt.
+            items (int): Number of summaries expected, used to size the output budget.
+            schema (dict): JSON schema the answer must follow, None for free text.
+        """
+        raise NotImplementedError
+
+    def _send(self, request: dict):
+        """
+        Make the SDK call with the request built by `_build_request`.
+        """
+        raise NotImplementedError
+
+    async def _asend(self, request: dict):
+        """
+        Coroutine variant of `_send`. Engines whose SDK has an async client
+        override it; the default offloads `_send` to a worker thread.
+        """
+        return await asyncio.to_thread(self._send, request)
+
+    def _parse_response(self, request: dict, response) -> str:
+        """
+        Record the response's token usage and return its text.
+        """
+        raise NotImplementedError
+
+    def _generate(self, system: str, user: str, items: int = 1, schema: Optional[dict] = None) -> str:
+        """
+        Send one request to the provider.
+
+        Args:
+            system (str): System prompt.
+            user (str): User prompt.
+            items (int): Number of summaries expected, used to size the output budget.
+            schema (dict): JSON schema the answer must follow, None for free text.
+
+        Returns:
+            str: The model's response text.
+        """
+        try:
+            request = self._build_request(system, user, items, schema)
+            return self._parse_response(request, self._send(request))
+        except Exception as e:
+            logger.error(f"{self.PROVIDER} summarization failed: {e}")
+            raise
+
+    async def _agenerate(self, system: str, user: str, items: int = 1, schema: Optional[dict] = None) -> str:
+        """
+        Coroutine variant of `_generate`.
+        """
+        try:
+            request = self._build_request(system, user, items, schema)
+            return self._parse_response(request, await self._asend(request))
+        except Exception as e:
+            logger.error(f"{self.PROVIDER} summarization failed: {e}")
+            raise
+
+    def _request(self, system: str, user: str, items: int = 1, schema: Optional[dict] = None) -> str:
+        waited = ai_rate_limiter.acquire()
+        if waited:
+            logger.info(f"AI rate limit reached, waited {waited:.1f}s")
+        return self._generate(system, user, items, schema)
+
+    def _record_usage(self, input_tokens: Optional[int], cached_tokens: Optional[int] = 0) -> None:
+        """
+        Count a request's input tokens and how many came from the provider's prompt cache.
+        """
+        if input_tokens is not None:
+            token_usage.record(f"{self.PROVIDER}/{self.model}", input_tokens, cached_tokens or 0)
+
+    def _record_chat_usage(self, usage) -> None:
+        """
+        Record the `usage` of an OpenAI-compatible chat completion.
+
+        OpenAI and Groq report cache hits in `prompt_tokens_details.cached_tokens`,
+        DeepSeek in `prompt_cache_hit_tokens`.
+        """
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) or getattr(usage, "prompt_cache_hit_tokens", None)
+        self._record_usage(getattr(usage, "prompt_tokens", None), cached)
+
+    @staticmethod
+    def _summarize_prompt(text: str) -> Tuple[str, Optional[dict]]:
+        """
+        User prompt and answer schema for one text, following STRUCTURED_OUTPUT.
+        """
+        from src.utils.prompts import SUMMARY_SCHEMA, get_structured_summarize_prompt, get_summarize_prompt
+
+        if structured_output():
+            return get_structured_summarize_prompt(text), SUMMARY_SCHEMA
+        return get_summarize_prompt(text), None
+
+    @staticmethod
+    def _batch_prompt(texts: List[str]) -> Tuple[str, Optional[dict]]:
+        from src.utils.prompts import (
+            BATCH_SUMMARY_SCHEMA, get_batch_summarize_prompt, get_structured_batch_summarize_prompt
+        )
+
+        if structured_output():
+            return get_structured_batch_summarize_prompt(texts), BATCH_SUMMARY_SCHEMA
+        return get_batch_summarize_prompt(texts), None
+
+    @staticmethod
+    def _json_mode(schema: Optional[dict]) -> dict:
+        """
+        `response_format` for OpenAI-compatible APIs that have a JSON mode but no schemas.
+        """
+        return {"response_format": {"type": "json_object"}} if schema else {}
+
+    @staticmethod
+    def _parse_answer(response: str, schema: Optional[dict]) -> str:
+        from src.utils.prompts import parse_structured_response
+
+        return parse_structured_response(response) if schema else response
+
+    def _fit_input(self, text: str) -> str:
+        """
+        Trim text that would not fit the model's context window next to the prompt.
+        """
+        from src.utils.prompts import get_system_prompt
+
+        counter = TokenCounter(self.model)
+        overhead = get_system_prompt() + self._summarize_prompt("")[0]
+        budget = input_budget(self.model, counter, overhead, output_tokens=SUMMARY_OUTPUT_TOKENS, engine=self.ENGINE)
+        fitted = counter.truncate(text, budget)
+        if fitted is not text:
+            logger.warning(f"Input trimmed to {budget} tokens to fit {self.model}'s context window")
+        return fitted
+
+    def summarize(self, text: str) -> str:
+        from src.utils.prompts import get_system_prompt
+
+        logger.info(f"Summarizing text with {self.PROVIDER} model: {self.model}")
+        user, schema = self._summarize_prompt(self._fit_input(text))
+        return self._parse_answer(self._request(get_system_prompt(), user, schema=schema), schema)
+
+    async def asummarize(self, text: str) -> str:
+        from src.utils.prompts import get_system_prompt
+
+        # Reserve the rate-limit slot without blocking the event loop
+        wait = ai_rate_limiter.reserve()
+        if wait > 0:
+            logger.info(f"AI rate limit reached, waiting {wait:.1f}s")
+            await asyncio.sleep(wait)
+
+        logger.info(f"Summarizing text with {self.PROVIDER} model: {self.model} (async)")
+        user, schema = self._summarize_prompt(self._fit_input(text))
+        return self._parse_answer(await self._agenerate(get_system_prompt(), user, schema=schema), schema)
+
+    def summarize_batch(self, texts: List[str]) -> List[str]:
+        from src.utils.prompts import get_system_prompt, split_batch_response, split_structured_batch_response
+
+        results = [None] * len(texts)
+        for chunk in self._pack(texts):
+            if len(chunk) == 1:
+                results[chunk[0]] = self.summarize(texts[chunk[0]])
+                continue
+
+            logger.info(f"Summarizing {len(chunk)} texts in one request with {self.PROVIDER} model: {self.model}")
+            user, schema = self._batch_prompt([texts[i] for i in chunk])
+            response = self._request(get_system_prompt(), user, items=len(chunk), schema=schema)
+            split = split_structured_batch_response if schema else split_batch_response
+            parts = split(response, len(chunk))
+            for position, index in enumerate(chunk):
+                if position in parts:
+                    results[index] = parts[position]
+                else:
+                    logger.warning(f"Batch response is missing item {position + 1}/{len(chunk)}, summarizing it on its own")
+                    results[index] = self.summarize(texts[index])
+        return results
+
+    def _batch_size(self) -> int:
+        """
+        Texts per batch request: SUMMARY_BATCH_SIZE, limited so the answers
+        (MAX_TOKENS_PER_ITEM each) stay within the model's output limit.
+        """
+        _, max_output = get_model_limits(self.model, self.ENGINE)
+        return max(1, min(settings.SUMMARY_BATCH_SIZE, max_output // self.MAX_TOKENS_PER_ITEM))
+
+    def _pack(self, texts: List[str]) -> List[List[int]]:
+        """
+        Group text indexes into requests: long texts go alone, short ones are
+        packed up to `_batch_size()` per request while the texts and their
+        answers fit the model's context window.
+        """
+        from src.utils.prompts import get_system_prompt
+
+        size = self._batch_size()
+        counter = TokenCounter(self.model)
+        context, _ = get_model_limits(self.model, self.ENGINE)
+        overhead = counter.count(get_system_prompt() + self._batch_prompt([])[0])
+
+        chunks, current, used = [], [], 0
+        for index, text in enumerate(texts):
+            cost = counter.count(text) + SUMMARY_OUTPUT_TOKENS
+            if len(text) > settings.SUMMARY_BATCH_MAX_CHARS or overhead + cost > context:
+                chunks.append([index])
+                continue
+            if current and (len(current) == size or overhead + used + cost > context):
+                chunks.append(current)
+                current, used = [], 0
+            current.append(index)
+            used += cost
+        if current:
+            chunks.append(current)
+        return chunks
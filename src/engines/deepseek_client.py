@@ -1,21 +1,24 @@
 import logging
-from .base import BaseEngine
+from .base import PromptEngine
 from src.utils.config import settings
 
 logger = logging.getLogger(__name__)
 
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI, OpenAI
 except ImportError:
     OpenAI = None
+    AsyncOpenAI = None
 
-class DeepSeekEngine(BaseEngine):
+class DeepSeekEngine(PromptEngine):
     """
     AI Engine for DeepSeek API (OpenAI-compatible).
     
     DeepSeek provides cost-effective AI models with OpenAI-compatible API.
     Extremely affordable pricing ($0.14/1M tokens) with GPT-4 level performance.
     """
+    PROVIDER = "DeepSeek"
+
     def __init__(self, model: str = "deepseek-chat"):
         if not OpenAI:
             raise ImportError("openai library not installed. DeepSeek uses OpenAI-compatible API.")
@@ -29,23 +32,28 @@ class DeepSeekEngine(BaseEngine):
             api_key=api_key,
             base_url="https://api.deepseek.com"
         )
+        self.async_client = AsyncOpenAI(
+            api_key=api_key,
+            base_url="https://api.deepseek.com"
+        )
         self.model = model
     
-    def summarize(self, text: str) -> str:
-        try:
-            logger.info(f"Summarizing text with DeepSeek model: {self.model}")
-            
-            # Use centralized prompts
-            from src.utils.prompts import get_system_prompt, get_summarize_prompt
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": get_system_prompt()},
-                    {"role": "user", "content": get_summarize_prompt(text)}
-                ]
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            logger.error(f"DeepSeek summarization failed: {e}")
-            raise
+    def _build_request(self, system: str, user: str, items: int, schema: dict) -> dict:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user}
+            ],
+            **self._json_mode(schema)
+        }
+
+    def _send(self, request: dict):
+        return self.client.chat.completions.create(**request)
+
+    async def _asend(self, request: dict):
+        return await self.async_client.chat.completions.create(**request)
+
+    def _parse_response(self, request: dict, response) -> str:
+        self._record_chat_usage(getattr(response, "usage", None))
+        return response.choices[0].message.content
@@ -1,40 +1,98 @@
-from typing import Literal, Union
+import atexit
+import importlib
+import logging
+import threading
+from importlib.metadata import entry_points
+from typing import Dict, List, Literal, NamedTuple, Optional, Tuple, Type
 from .base import BaseEngine
-from .ollama_client import OllamaEngine
-from .openai_client import OpenAIEngine
-
-try:
-    from .anthropic_client import AnthropicEngine
-except ImportError:
-    AnthropicEngine = None
-
-try:
-    from .transformers_client import TransformersEngine
-except ImportError:
-    TransformersEngine = None
-
-try:
-    from .gemini_client import GeminiEngine
-except ImportError:
-    GeminiEngine = None
-
-try:
-    from .groq_client import GroqEngine
-except ImportError:
-    GroqEngine = None
-
-try:
-    from .mistral_client import MistralEngine
-except ImportError:
-    MistralEngine = None
-
-try:
-    from .deepseek_client import DeepSeekEngine
-except ImportError:
-    DeepSeekEngine = None
+
+logger = logging.getLogger(__name__)
 
 EngineType = Literal["ollama", "openai", "anthropic", "transformers", "gemini", "groq", "mistral", "deepseek"]
 
+# Third-party engines register a BaseEngine subclass under this entry point group, e.g.
+# [project.entry-points."aws_brief.engines"]
+# bedrock = "aws_brief_bedrock:BedrockEngine"
+ENTRY_POINT_GROUP = "aws_brief.engines"
+
+
+class EngineSpec(NamedTuple):
+    """
+    Where a built-in engine lives. The module (and its SDK) is only imported
+    when the engine is first requested.
+    """
+    target: str
+    default_model: str
+    missing: str
+
+
+ENGINE_REGISTRY: Dict[str, EngineSpec] = {
+    "ollama": EngineSpec("src.engines.ollama_client:OllamaEngine", "llama3.3", "Ollama dependency missing. Install with: pip install ollama"),
+    "openai": EngineSpec("src.engines.openai_client:OpenAIEngine", "gpt-4o-mini", "OpenAI dependency missing. Install with: pip install openai"),
+    "anthropic": EngineSpec("src.engines.anthropic_client:AnthropicEngine", "claude-3-5-sonnet-20241022", "Anthropic dependency missing."),
+    "transformers": EngineSpec("src.engines.transformers_client:TransformersEngine", "facebook/bart-large-cnn", "Transformers/Torch dependency missing."),
+    "gemini": EngineSpec("src.engines.gemini_client:GeminiEngine", "gemini-2.0-flash", "Google Generative AI dependency missing."),
+    "groq": EngineSpec("src.engines.groq_client:GroqEngine", "mixtral-8x7b-32768", "Groq dependency missing."),
+    "mistral": EngineSpec("src.engines.mistral_client:MistralEngine", "mistral-large-latest", "Mistral dependency missing. Install with: pip install mistralai"),
+    "deepseek": EngineSpec("src.engines.deepseek_client:DeepSeekEngine", "deepseek-chat", "DeepSeek requires OpenAI library. Install with: pip install openai"),
+}
+
+_plugins: Optional[Dict[str, object]] = None
+_plugins_lock = threading.Lock()
+
+
+def _discover_plugins() -> Dict[str, object]:
+    """
+    Return the engine entry points of installed packages (not loaded yet), discovered once.
+    """
+    global _plugins
+    with _plugins_lock:
+        if _plugins is None:
+            try:
+                _plugins = {ep.name.lower(): ep for ep in entry_points(group=ENTRY_POINT_GROUP)}
+            except Exception as e:
+                logger.warning(f"Failed to discover engine plugins: {e}")
+                _plugins = {}
+            builtin = [name for name in _plugins if name in ENGINE_REGISTRY]
+            if builtin:
+                logger.warning(f"Ignoring engine plugins that shadow built-in engines: {', '.join(builtin)}")
+        return _plugins
+
+
+def available_engines() -> List[str]:
+    """
+    Names of the built-in and plugin engines, without importing any of them.
+    """
+    return list(ENGINE_REGISTRY) + sorted(name for name in _discover_plugins() if name not in ENGINE_REGISTRY)
+
+
+def load_engine_class(engine_type: str) -> Type[BaseEngine]:
+    """
+    Import and return the engine class registered under `engine_type`.
+
+    Raises:
+        ImportError: The engine's dependencies are not installed
+        ValueError: No engine is registered under that name
+    """
+    engine_type = engine_type.lower()
+    spec = ENGINE_REGISTRY.get(engine_type)
+    if spec is not None:
+        module_name, _, class_name = spec.target.partition(":")
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError as e:
+            raise ImportError(f"{spec.missing} ({e})") from e
+        return getattr(module, class_name)
+
+    plugin = _discover_plugins().get(engine_type)
+    if plugin is None:
+        raise ValueError(f"Unknown engine type: {engine_type}. Available: {', '.join(available_engines())}")
+    engine_class = plugin.load()
+    if not (isinstance(engine_class, type) and issubclass(engine_class, BaseEngine)):
+        raise TypeError(f"Engine plugin {engine_type} ({plugin.value}) is not a BaseEngine subclass")
+    return engine_class
+
+
 class EngineFactory:
     """
     Factory to instantiate the correct AI Engine based on configuration.
@@ -42,37 +100,13 @@ class EngineFactory:
     @staticmethod
     def get_engine(engine_type: str, model: str = None) -> BaseEngine:
         engine_type = engine_type.lower()
-        
-        if engine_type == "ollama":
-            return OllamaEngine(model=model or "llama3.3")
-        elif engine_type == "openai":
-            return OpenAIEngine(model=model or "gpt-4o-mini")
-        elif engine_type == "anthropic":
-            if not AnthropicEngine:
-                 raise ImportError("Anthropic dependency missing.")
-            return AnthropicEngine(model=model or "claude-3-5-sonnet-20241022")
-        elif engine_type == "transformers":
-             if not TransformersEngine:
-                 raise ImportError("Transformers/Torch dependency missing.")
-             return TransformersEngine(model=model or "facebook/bart-large-cnn")
-        elif engine_type == "gemini":
-             if not GeminiEngine:
-                 raise ImportError("Google Generative AI dependency missing.")
-             return GeminiEngine(model=model or "gemini-2.0-flash")
-        elif engine_type == "groq":
-             if not GroqEngine:
-                 raise ImportError("Groq dependency missing.")
-             return GroqEngine(model=model or "mixtral-8x7b-32768")
-        elif engine_type == "mistral":
-             if not MistralEngine:
-                 raise ImportError("Mistral dependency missing. Install with: pip install mistralai")
-             return MistralEngine(model=model or "mistral-large-latest")
-        elif engine_type == "deepseek":
-             if not DeepSeekEngine:
-                 raise ImportError("DeepSeek requires OpenAI library. Install with: pip install openai")
-             return DeepSeekEngine(model=model or "deepseek-chat")
-        else:
-            raise ValueError(f"Unknown engine type: {engine_type}")
+        engine_class = load_engine_class(engine_type)
+
+        spec = ENGINE_REGISTRY.get(engine_type)
+        if spec is not None:
+            return engine_class(model=model or spec.default_model)
+        # Plugins own their default model
+        return engine_class(model=model) if model else engine_class()
 
     @staticmethod
     def get_engine_with_fallback(
@@ -119,3 +153,60 @@ class EngineFactory:
         error_msg = f"All engines failed. Last error: {last_error}"
         logger.error(error_msg)
         raise Exception(error_msg)
+
+
+class EnginePool:
+    """
+    Thread-safe registry of warm engine instances keyed by (engine, model).
+
+    Engines are created once through EngineFactory and reused, so a local model
+    is loaded from disk once per process and API engines keep their SDK clients
+    and connection pools. Instances live until `close()` (also run at exit).
+    """
+    def __init__(self):
+        self._engines: Dict[Tuple[str, Optional[str]], BaseEngine] = {}
+        self._locks: Dict[Tuple[str, Optional[str]], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, engine_type: str, model: str = None) -> BaseEngine:
+        """
+        Return the pooled engine for (engine_type, model), creating it on first use.
+        """
+        key = (engine_type.lower(), model)
+        engine = self._engines.get(key)
+        if engine is not None:
+            return engine
+
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        # Per-key lock: concurrent callers wait for one load instead of loading twice,
+        # while engines with other keys can load in parallel
+        with key_lock:
+            engine = self._engines.get(key)
+            if engine is None:
+                logger.info(f"Creating pooled engine: {key[0]} ({model or 'default model'})")
+                engine = EngineFactory.get_engine(*key)
+                self._engines[key] = engine
+        return engine
+
+    def close(self, engine_type: str = None, model: str = None) -> None:
+        """
+        Close and drop pooled engines. Without arguments every engine is closed;
+        with `engine_type` (and optionally `model`) only the matching ones.
+        """
+        with self._lock:
+            keys = [
+                key for key in self._engines
+                if engine_type is None or (key[0] == engine_type.lower() and (model is None or key[1] == model))
+            ]
+            engines = [self._engines.pop(key) for key in keys]
+
+        for engine in engines:
+            try:
+                engine.close()
+            except Exception as e:
+                logger.warning(f"Failed to close engine {type(engine).__name__}: {e}")
+
+
+engine_pool = EnginePool()
+atexit.register(engine_pool.close)
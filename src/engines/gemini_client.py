@@ -1,5 +1,5 @@
 import logging
-from .base import BaseEngine
+from .base import PromptEngine
 from src.utils.config import settings
 
 logger = logging.getLogger(__name__)
@@ -9,10 +9,12 @@ try:
 except ImportError:
     genai = None
 
-class GeminiEngine(BaseEngine):
+class GeminiEngine(PromptEngine):
     """
     AI Engine for Google Gemini (Vertex AI / Studio) using new google-genai SDK.
     """
+    PROVIDER = "Google Gemini"
+
     def __init__(self, model: str = "gemini-2.0-flash"):
         if not genai:
              raise ImportError("google-genai library not installed.")
@@ -22,23 +24,36 @@ class GeminiEngine(BaseEngine):
              logger.warning("Google API Key not found.")
         
         self.client = genai.Client(api_key=api_key)
+        self.model = model
         self.model_name = model
 
-    def summarize(self, text: str) -> str:
-        try:
-            logger.info(f"Summarizing text with Google Gemini model: {self.model_name}")
-            
-            # Use centralized prompts
-            from src.utils.prompts import get_system_prompt, get_summarize_prompt
-            
+    def _record_gemini_usage(self, response) -> None:
+        # Gemini 2.5+ caches repeated prompt prefixes implicitly
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            self._record_usage(usage.prompt_token_count, usage.cached_content_token_count)
+
+    @staticmethod
+    def _json_config(schema: dict) -> dict:
+        # JSON mode; the schema itself is given in the prompt, as Gemini's
+        # response_schema rejects parts of JSON Schema (additionalProperties)
+        return {"config": {"response_mime_type": "application/json"}} if schema else {}
+
+    def _build_request(self, system: str, user: str, items: int, schema: dict) -> dict:
+        return {
+            "model": self.model_name,
             # Combine system and user prompts for Gemini
-            full_prompt = f"{get_system_prompt()}\n\n{get_summarize_prompt(text)}"
-            
-            response = self.client.models.generate_content(
-                model=self.model_name, 
-                contents=full_prompt
-            )
-            return response.text
-        except Exception as e:
-            logger.error(f"Gemini summarization failed: {e}")
-            raise
+            "contents": f"{system}\n\n{user}",
+            **self._json_config(schema)
+        }
+
+    def _send(self, request: dict):
+        return self.client.models.generate_content(**request)
+
+    async def _asend(self, request: dict):
+        # Async variants of the google-genai client live under `aio`
+        return await self.client.aio.models.generate_content(**request)
+
+    def _parse_response(self, request: dict, response) -> str:
+        self._record_gemini_usage(response)
+        return response.text
@@ -1,18 +1,21 @@
 import logging
-from .base import BaseEngine
+from .base import PromptEngine
 from src.utils.config import settings
 
 logger = logging.getLogger(__name__)
 
 try:
-    from groq import Groq
+    from groq import AsyncGroq, Groq
 except ImportError:
     Groq = None
+    AsyncGroq = None
 
-class GroqEngine(BaseEngine):
+class GroqEngine(PromptEngine):
     """
     AI Engine for Groq (LPU Inference).
     """
+    PROVIDER = "Groq"
+
     def __init__(self, model: str = "mixtral-8x7b-32768"):
         if not Groq:
              raise ImportError("groq library not installed.")
@@ -22,23 +25,25 @@ class GroqEngine(BaseEngine):
              logger.warning("Groq API Key not found.")
         
         self.client = Groq(api_key=api_key)
+        self.async_client = AsyncGroq(api_key=api_key)
         self.model = model
 
-    def summarize(self, text: str) -> str:
-        try:
-            logger.info(f"Summarizing text with Groq model: {self.model}")
-            
-            # Use centralized prompts
-            from src.utils.prompts import get_system_prompt, get_summarize_prompt
-            
-            chat_completion = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": get_system_prompt()},
-                    {"role": "user", "content": get_summarize_prompt(text)}
-                ],
-                model=self.model,
-            )
-            return chat_completion.choices[0].message.content
-        except Exception as e:
-            logger.error(f"Groq summarization failed: {e}")
-            raise
+    def _build_request(self, system: str, user: str, items: int, schema: dict) -> dict:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user}
+            ],
+            **self._json_mode(schema)
+        }
+
+    def _send(self, request: dict):
+        return self.client.chat.completions.create(**request)
+
+    async def _asend(self, request: dict):
+        return await self.async_client.chat.completions.create(**request)
+
+    def _parse_response(self, request: dict, response) -> str:
+        self._record_chat_usage(getattr(response, "usage", None))
+        return response.choices[0].message.content
@@ -0,0 +1,210 @@
+"""
+Hedged requests across engines.
+
+When the primary engine has not answered within a high percentile of its own
+recent latency, `HedgedEngine` sends the same request to a secondary engine
+(AI_HEDGE_ENGINE) and returns whichever answer arrives first. Opt-in: hedging
+spends extra tokens on the slow tail to keep notification latency low.
+"""
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .base import BaseEngine
+from .resilient import ResilientEngine, get_resilient_engine, parse_fallback_chain
+from src.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """
+    Rolling window of the most recent per-item latencies of one engine/model.
+    """
+    def __init__(self, size: int = 200):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Return the given percentile (0-100) of the recorded latencies, or None without samples.
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, int(round(percentile / 100 * (len(samples) - 1)))))
+        return samples[index]
+
+
+_histograms: Dict[str, LatencyHistogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def get_latency_histogram(provider: str) -> LatencyHistogram:
+    """
+    Return the process-wide latency histogram of a provider ("engine/model").
+    """
+    with _histograms_lock:
+        histogram = _histograms.get(provider)
+        if histogram is None:
+            histogram = LatencyHistogram()
+            _histograms[provider] = histogram
+        return histogram
+
+
+class HedgedEngine(BaseEngine):
+    """
+    Engine racing a primary and a secondary engine for slow requests.
+
+    The hedge is sent once the primary has been running longer than its
+    AI_HEDGE_PERCENTILE latency (AI_HEDGE_DELAY until AI_HEDGE_MIN_SAMPLES
+    latencies are known). Both legs are ResilientEngines, so retries and
+    failover still apply. In `asummarize` the losing request is cancelled;
+    blocking SDK calls cannot be interrupted, so in `summarize` the loser
+    finishes in the background and only contributes its latency.
+    """
+    def __init__(
+        self,
+        primary: ResilientEngine,
+        secondary: ResilientEngine,
+        percentile: float = settings.AI_HEDGE_PERCENTILE,
+        default_delay: float = settings.AI_HEDGE_DELAY,
+        min_samples: int = settings.AI_HEDGE_MIN_SAMPLES
+    ):
+        self.primary = primary
+        self.secondary = secondary
+        self.percentile = percentile
+        self.default_delay = default_delay
+        self.min_samples = min_samples
+        self.model = primary.model
+        # Losers keep running in the background, so leave room beyond one pair per worker
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(4, 4 * settings.SUMMARY_WORKERS),
+            thread_name_prefix="hedge"
+        )
+
+    @staticmethod
+    def _provider(engine: ResilientEngine) -> str:
+        primary_engine, primary_model = engine.chain[0]
+        return engine.provider_name(primary_engine, primary_model)
+
+    def hedge_delay(self, items: int = 1) -> float:
+        """
+        Seconds to wait for the primary before sending the hedge request.
+        """
+        histogram = get_latency_histogram(self._provider(self.primary))
+        if len(histogram) < self.min_samples:
+            return self.default_delay * items
+        return histogram.percentile(self.percentile) * items
+
+    def _timed(self, engine: ResilientEngine, call: Callable[[BaseEngine], Any], items: int) -> Any:
+        started = time.monotonic()
+        result = call(engine)
+        get_latency_histogram(self._provider(engine)).record((time.monotonic() - started) / items)
+        return result
+
+    def _submit(self, engine: ResilientEngine, call: Callable[[BaseEngine], Any], items: int):
+        # Run in a copy of the caller's context (e.g. `free_text` for digests)
+        return self._executor.submit(contextvars.copy_context().run, self._timed, engine, call, items)
+
+    def _race(self, call: Callable[[BaseEngine], Any], items: int = 1) -> Any:
+        delay = self.hedge_delay(items)
+        primary = self._submit(self.primary, call, items)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        logger.info(f"{self._provider(self.primary)} slower than {delay:.1f}s, hedging with {self._provider(self.secondary)}")
+        secondary = self._submit(self.secondary, call, items)
+        pending = {primary, secondary}
+        last_error: Optional[Exception] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                for loser in pending:
+                    loser.cancel()
+                return result
+        raise last_error
+
+    async def _atimed(self, engine: ResilientEngine, text: str) -> str:
+        started = time.monotonic()
+        result = await engine.asummarize(text)
+        get_latency_histogram(self._provider(engine)).record(time.monotonic() - started)
+        return result
+
+    def summarize(self, text: str) -> str:
+        return self._race(lambda engine: engine.summarize(text))
+
+    def summarize_batch(self, texts: List[str]) -> List[str]:
+        return self._race(lambda engine: engine.summarize_batch(texts), items=max(1, len(texts)))
+
+    async def asummarize(self, text: str) -> str:
+        delay = self.hedge_delay()
+        primary = asyncio.create_task(self._atimed(self.primary, text))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        logger.info(f"{self._provider(self.primary)} slower than {delay:.1f}s, hedging with {self._provider(self.secondary)}")
+        secondary = asyncio.create_task(self._atimed(self.secondary, text))
+        pending = {primary, secondary}
+        last_error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+                    return task.result()
+            raise last_error
+        finally:
+            # Cancelling the task aborts the loser's in-flight HTTP request
+            for task in pending:
+                task.cancel()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_hedged_engines: Dict[Tuple[str, Optional[str]], HedgedEngine] = {}
+_hedged_lock = threading.Lock()
+
+
+def get_hedged_engine(engine_type: str, model: Optional[str] = None) -> BaseEngine:
+    """
+    Return the shared HedgedEngine for (engine_type, model) racing against
+    AI_HEDGE_ENGINE, or the plain ResilientEngine when hedging is disabled.
+    """
+    secondary = parse_fallback_chain(settings.AI_HEDGE_ENGINE)
+    if not secondary or secondary[0] == (engine_type.lower(), model):
+        return get_resilient_engine(engine_type, model)
+
+    key = (engine_type.lower(), model)
+    with _hedged_lock:
+        engine = _hedged_engines.get(key)
+        if engine is None:
+            engine = HedgedEngine(
+                get_resilient_engine(engine_type, model),
+                get_resilient_engine(*secondary[0])
+            )
+            _hedged_engines[key] = engine
+        return engine
@@ -1,5 +1,5 @@
 import logging
-from .base import BaseEngine
+from .base import PromptEngine
 from src.utils.config import settings
 
 logger = logging.getLogger(__name__)
@@ -9,13 +9,15 @@ try:
 except ImportError:
     Mistral = None
 
-class MistralEngine(BaseEngine):
+class MistralEngine(PromptEngine):
     """
     AI Engine for Mistral AI API.
     
     Mistral AI provides state-of-the-art open-source and commercial LLMs
     with strong performance on reasoning, coding, and multilingual tasks.
     """
+    PROVIDER = "Mistral"
+
     def __init__(self, model: str = "mistral-large-latest"):
         if not Mistral:
             raise ImportError("mistralai library not installed. Install with `pip install mistralai`")
@@ -27,21 +29,23 @@ class MistralEngine(BaseEngine):
         self.client = Mistral(api_key=api_key)
         self.model = model
     
-    def summarize(self, text: str) -> str:
-        try:
-            logger.info(f"Summarizing text with Mistral model: {self.model}")
-            
-            # Use centralized prompts
-            from src.utils.prompts import get_system_prompt, get_summarize_prompt
-            
-            response = self.client.chat.complete(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": get_system_prompt()},
-                    {"role": "user", "content": get_summarize_prompt(text)}
-                ]
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            logger.error(f"Mistral summarization failed: {e}")
-            raise
+    def _build_request(self, system: str, user: str, items: int, schema: dict) -> dict:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user}
+            ],
+            **self._json_mode(schema)
+        }
+
+    def _send(self, request: dict):
+        return self.client.chat.complete(**request)
+
+    async def _asend(self, request: dict):
+        # The Mistral SDK exposes async variants on the same client
+        return await self.client.chat.complete_async(**request)
+
+    def _parse_response(self, request: dict, response) -> str:
+        self._record_chat_usage(getattr(response, "usage", None))
+        return response.choices[0].message.content
@@ -1,44 +1,135 @@
+import asyncio
 import logging
+import threading
 try:
     import ollama
 except ImportError:
     ollama = None
 
-from .base import BaseEngine
+from .base import PromptEngine
 from src.utils.config import settings
+from src.utils.tokens import CHARS_PER_TOKEN, TokenCounter, get_model_limits
 
 logger = logging.getLogger(__name__)
 
-class OllamaEngine(BaseEngine):
+class OllamaEngine(PromptEngine):
     """
     AI Engine for local Ollama instance.
+
+    Requests keep the model loaded for OLLAMA_KEEP_ALIVE and always start with
+    the same system prompt and static summarize prefix, so the server reuses
+    the prefix's KV cache instead of evaluating it again.
+
+    The context window (`num_ctx`) is fixed to what the largest summarize
+    request needs, because Ollama reloads the model whenever it changes;
+    only prompts that do not fit (digests, very long items) get a window
+    sized to the prompt, capped at OLLAMA_MAX_CTX. At most
+    OLLAMA_NUM_PARALLEL requests are in flight at once, matching the
+    server's parallel slots.
     """
+    PROVIDER = "Ollama"
+    ENGINE = "ollama"
+    MAX_TOKENS_PER_ITEM = 800
+
     def __init__(self, model: str = "llama3.3"):
         self.model = model
         host = settings.OLLAMA_HOST
-        # Ensure proper initialization of client if library supports it, 
+        # Ensure proper initialization of client if library supports it,
         # otherwise basic usage might differ. Assuming standard python-ollama lib.
         if ollama:
             self.client = ollama.Client(host=host)
+            self.async_client = ollama.AsyncClient(host=host)
         else:
             logger.warning("Ollama library not installed. Functionality will be limited.")
             self.client = None
+            self.async_client = None
+
+        self.counter = TokenCounter(model)
+        self.context_tokens, _ = get_model_limits(model, self.ENGINE)
+        self.summary_ctx = min(self.context_tokens, settings.OLLAMA_NUM_CTX or self._summary_ctx())
+        self._slots = threading.BoundedSemaphore(max(1, settings.OLLAMA_NUM_PARALLEL))
+
+    def _summary_ctx(self) -> int:
+        """
+        Context needed by a full summarize batch, rounded up to a multiple of 1024.
+        """
+        from src.utils.prompts import get_batch_summarize_prompt, get_system_prompt
+
+        overhead = self.counter.count(get_system_prompt() + get_batch_summarize_prompt([]))
+        per_item = int(settings.SUMMARY_BATCH_MAX_CHARS / CHARS_PER_TOKEN) + self.MAX_TOKENS_PER_ITEM
+        needed = overhead + self._batch_size() * per_item
+        return -(-needed // 1024) * 1024
+
+    def _build_request(self, system: str, user: str, items: int, schema: dict = None) -> dict:
+        # Combine system and user prompts for Ollama
+        prompt = f"{system}\n\n{user}"
+        prompt_tokens = self.counter.count(prompt)
+        num_predict = self.MAX_TOKENS_PER_ITEM * items
+        needed = prompt_tokens + num_predict
+        if needed <= self.summary_ctx:
+            num_ctx = self.summary_ctx
+        else:
+            # Sized to the prompt: the KV cache grows with num_ctx, the model's full window may not fit in memory
+            num_ctx = min(self.context_tokens, -(-needed // 1024) * 1024)
+        request = {
+            "model": self.model,
+            "prompt": prompt,
+            "keep_alive": settings.OLLAMA_KEEP_ALIVE,
+            "options": {"num_ctx": num_ctx, "num_predict": num_predict}
+        }
+        if schema:
+            # Structured outputs: generation is constrained to the JSON schema
+            request["format"] = schema
+        return request
 
-    def summarize(self, text: str) -> str:
+    def _record_eval_usage(self, prompt: str, response) -> None:
+        # Ollama only reports the prompt tokens it had to evaluate; the tokens
+        # served from the KV cache are the rest of the (estimated) prompt
+        evaluated = response.get('prompt_eval_count')
+        if evaluated is None:
+            return
+        total = max(evaluated, self.counter.count(prompt))
+        self._record_usage(total, total - evaluated)
+
+    def warm(self) -> None:
+        """
+        Load the model into the Ollama server ahead of the first request.
+
+        An empty prompt only loads the model; it uses the summarize context
+        size so the first real request does not trigger a reload.
+        """
+        if not self.client:
+            return
+        logger.info(f"Pre-warming Ollama model {self.model} (num_ctx {self.summary_ctx})")
+        self.client.generate(
+            model=self.model,
+            prompt="",
+            keep_alive=settings.OLLAMA_KEEP_ALIVE,
+            options={"num_ctx": self.summary_ctx}
+        )
+
+    def _send(self, request: dict):
         if not self.client:
             raise RuntimeError("Ollama library not installed.")
-        
+        with self._slots:
+            return self.client.generate(**request)
+
+    async def _asend(self, request: dict):
+        if not self.async_client:
+            raise RuntimeError("Ollama library not installed.")
+        # The slots are shared with the sync path, so wait for one off the event loop
+        acquire = asyncio.ensure_future(asyncio.to_thread(self._slots.acquire))
         try:
-            logger.info(f"Summarizing text with Ollama model: {self.model}")
-            
-            # Use centralized prompts
-            from src.utils.prompts import get_system_prompt, get_summarize_prompt
-            
-            # Combine system and user prompts for Ollama
-            full_prompt = f"{get_system_prompt()}\n\n{get_summarize_prompt(text)}"
-            
-            response = self.client.generate(model=self.model, prompt=full_prompt)
-            return response.get('response', '')
-        except Exception as e:
-            logger.error(f"Ollama summarization failed: {e}")
+            await asyncio.shield(acquire)
+        except asyncio.CancelledError:
+            # Cancelled while waiting (e.g. a hedged loser): give the slot back once acquired
+            acquire.add_done_callback(lambda _: self._slots.release())
             raise
+        try:
+            return await self.async_client.generate(**request)
+        finally:
+            self._slots.release()
+
+    def _parse_response(self, request: dict, response) -> str:
+        self._record_eval_usage(request["prompt"], response)
+        return response.get('response', '')
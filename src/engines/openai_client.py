@@ -1,18 +1,35 @@
 import logging
-from .base import BaseEngine
+from .base import PromptEngine
 from src.utils.config import settings
 
 logger = logging.getLogger(__name__)
 
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI, OpenAI
 except ImportError:
     OpenAI = None
+    AsyncOpenAI = None
 
-class OpenAIEngine(BaseEngine):
+class OpenAIEngine(PromptEngine):
     """
     AI Engine for OpenAI API.
+
+    OpenAI caches prompt prefixes automatically (from 1024 tokens); the system
+    prompt and the static summarize prefix always come first, so consecutive
+    requests share that prefix.
     """
+    PROVIDER = "OpenAI"
+
+    @staticmethod
+    def _response_format(schema: dict) -> dict:
+        # Structured Outputs: the answer is guaranteed to match the schema
+        if not schema:
+            return {}
+        return {"response_format": {
+            "type": "json_schema",
+            "json_schema": {"name": "summary", "schema": schema, "strict": True}
+        }}
+
     def __init__(self, model: str = "gpt-4o-mini"):
         if not OpenAI:
              raise ImportError("openai library not installed.")
@@ -22,23 +39,25 @@ class OpenAIEngine(BaseEngine):
              logger.warning("OpenAI API Key not found.")
         
         self.client = OpenAI(api_key=api_key)
+        self.async_client = AsyncOpenAI(api_key=api_key)
         self.model = model
 
-    def summarize(self, text: str) -> str:
-        try:
-            logger.info(f"Summarizing text with OpenAI model: {self.model}")
-            
-            # Use centralized prompts
-            from src.utils.prompts import get_system_prompt, get_summarize_prompt
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": get_system_prompt()},
-                    {"role": "user", "content": get_summarize_prompt(text)}
-                ]
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            logger.error(f"OpenAI summarization failed: {e}")
-            raise
+    def _build_request(self, system: str, user: str, items: int, schema: dict) -> dict:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user}
+            ],
+            **self._response_format(schema)
+        }
+
+    def _send(self, request: dict):
+        return self.client.chat.completions.create(**request)
+
+    async def _asend(self, request: dict):
+        return await self.async_client.chat.completions.create(**request)
+
+    def _parse_response(self, request: dict, response) -> str:
+        self._record_chat_usage(getattr(response, "usage", None))
+        return response.choices[0].message.content
@@ -0,0 +1,263 @@
+"""
+Runtime failover for AI engines.
+
+`ResilientEngine` wraps a primary engine and an optional fallback chain
+(AI_FALLBACK_ENGINES). Each request is retried with jittered exponential
+backoff (AI_MAX_RETRIES / AI_RETRY_DELAY) while the error is transient, then
+moves on to the next provider. Per-provider circuit breakers skip providers
+that keep failing, so a brownout costs seconds instead of a full cycle.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .base import BaseEngine, Summary
+from .factory import engine_pool
+from src.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After `failure_threshold` failures in a row the circuit opens and requests
+    are refused for `reset_timeout` seconds. Then one trial request is let
+    through (half-open): success closes the circuit, failure opens it again.
+    Only transient errors (`is_retryable`) count as failures; errors caused by
+    the request itself say nothing about the provider's health.
+    """
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        """
+        Check whether a request may be sent now.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_request_error(self) -> None:
+        """
+        The request was rejected for reasons of its own: end a half-open trial
+        without changing the circuit state.
+        """
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """
+    Return the process-wide circuit breaker of a provider ("engine/model").
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(provider)
+        if breaker is None:
+            breaker = CircuitBreaker(settings.AI_CIRCUIT_FAILURES, settings.AI_CIRCUIT_RESET)
+            _breakers[provider] = breaker
+        return breaker
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Decide whether an engine error is transient (worth retrying on the same provider).
+
+    HTTP errors are retried on 408, 409, 429 and 5xx; other client errors
+    (bad key, bad request, unknown model) move straight to the next provider.
+    Errors without a status (timeouts, connection resets) are retried.
+    """
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if not isinstance(status, int):
+        return not isinstance(error, (ImportError, ValueError, TypeError))
+    return status in (408, 409, 429) or status >= 500
+
+
+def parse_fallback_chain(value: str) -> List[Tuple[str, Optional[str]]]:
+    """
+    Parse "engine[:model],engine[:model]" (e.g. "anthropic,ollama:llama3.3").
+    """
+    chain = []
+    for entry in (value or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        engine_type, _, model = entry.partition(":")
+        chain.append((engine_type.strip().lower(), model.strip() or None))
+    return chain
+
+
+class ResilientEngine(BaseEngine):
+    """
+    Engine wrapper adding retries, circuit breaking and runtime failover.
+
+    Summaries are returned as `Summary` strings whose `provider` names the
+    engine/model that actually produced them.
+    """
+    MAX_RETRY_DELAY = 30
+
+    def __init__(
+        self,
+        engine_type: str,
+        model: Optional[str] = None,
+        fallback_chain: Optional[List[Tuple[str, Optional[str]]]] = None,
+        max_retries: int = settings.AI_MAX_RETRIES,
+        retry_delay: float = settings.AI_RETRY_DELAY
+    ):
+        if fallback_chain is None:
+            fallback_chain = parse_fallback_chain(settings.AI_FALLBACK_ENGINES)
+        primary = (engine_type.lower(), model)
+        self.chain = [primary] + [entry for entry in fallback_chain if entry != primary]
+        self.max_retries = max(1, max_retries)
+        self.retry_delay = retry_delay
+        self.model = model
+
+    @staticmethod
+    def provider_name(engine_type: str, model: Optional[str]) -> str:
+        return f"{engine_type}/{model}" if model else engine_type
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter keeps parallel workers from retrying in lockstep
+        return min(self.MAX_RETRY_DELAY, self.retry_delay * (2 ** attempt)) * random.uniform(0.5, 1.0)
+
+    def _run(self, call: Callable[[BaseEngine], Any]) -> Tuple[Any, str]:
+        last_error: Optional[Exception] = None
+        for engine_type, model in self.chain:
+            provider = self.provider_name(engine_type, model)
+            breaker = get_circuit_breaker(provider)
+            if not breaker.allow():
+                logger.warning(f"Circuit open for {provider}, skipping it")
+                continue
+
+            for attempt in range(self.max_retries):
+                try:
+                    engine = engine_pool.get(engine_type, model)
+                    result = call(engine)
+                    breaker.record_success()
+                    return result, provider
+                except Exception as e:
+                    last_error = e
+                    if not is_retryable(e):
+                        # e.g. context length exceeded: must not open the circuit for every other item
+                        breaker.record_request_error()
+                        logger.warning(f"{provider} rejected the request ({e}), trying next provider")
+                        break
+                    breaker.record_failure()
+                    if attempt == self.max_retries - 1 or not breaker.allow():
+                        logger.warning(f"{provider} failed ({e}), trying next provider")
+                        break
+                    delay = self._backoff(attempt)
+                    logger.warning(f"{provider} failed (attempt {attempt + 1}/{self.max_retries}), retrying in {delay:.1f}s: {e}")
+                    time.sleep(delay)
+
+        if last_error is None:
+            raise RuntimeError("All AI providers are unavailable (circuits open)")
+        raise last_error
+
+    async def _arun(self, call: Callable[[BaseEngine], Any]) -> Tuple[Any, str]:
+        last_error: Optional[Exception] = None
+        for engine_type, model in self.chain:
+            provider = self.provider_name(engine_type, model)
+            breaker = get_circuit_breaker(provider)
+            if not breaker.allow():
+                logger.warning(f"Circuit open for {provider}, skipping it")
+                continue
+
+            for attempt in range(self.max_retries):
+                try:
+                    engine = await asyncio.to_thread(engine_pool.get, engine_type, model)
+                    result = await call(engine)
+                    breaker.record_success()
+                    return result, provider
+                except Exception as e:
+                    last_error = e
+                    if not is_retryable(e):
+                        # e.g. context length exceeded: must not open the circuit for every other item
+                        breaker.record_request_error()
+                        logger.warning(f"{provider} rejected the request ({e}), trying next provider")
+                        break
+                    breaker.record_failure()
+                    if attempt == self.max_retries - 1 or not breaker.allow():
+                        logger.warning(f"{provider} failed ({e}), trying next provider")
+                        break
+                    delay = self._backoff(attempt)
+                    logger.warning(f"{provider} failed (attempt {attempt + 1}/{self.max_retries}), retrying in {delay:.1f}s: {e}")
+                    await asyncio.sleep(delay)
+
+        if last_error is None:
+            raise RuntimeError("All AI providers are unavailable (circuits open)")
+        raise last_error
+
+    def summarize(self, text: str) -> str:
+        summary, provider = self._run(lambda engine: engine.summarize(text))
+        return Summary(summary, provider)
+
+    def summarize_batch(self, texts: List[str]) -> List[str]:
+        summaries, provider = self._run(lambda engine: engine.summarize_batch(texts))
+        return [Summary(summary, provider) for summary in summaries]
+
+    async def asummarize(self, text: str) -> str:
+        summary, provider = await self._arun(lambda engine: engine.asummarize(text))
+        return Summary(summary, provider)
+
+    def close(self) -> None:
+        # Wrapped engines belong to the engine pool
+        pass
+
+
+_resilient_engines: Dict[Tuple[str, Optional[str]], ResilientEngine] = {}
+_resilient_lock = threading.Lock()
+
+
+def get_resilient_engine(engine_type: str, model: Optional[str] = None) -> ResilientEngine:
+    """
+    Return the shared ResilientEngine for (engine_type, model).
+    """
+    key = (engine_type.lower(), model)
+    with _resilient_lock:
+        engine = _resilient_engines.get(key)
+        if engine is None:
+            engine = ResilientEngine(engine_type, model)
+            _resilient_engines[key] = engine
+        return engine
@@ -1,48 +1,203 @@
 import logging
-import torch
+import os
+import threading
+from typing import List
+
+import requests
+
 from .base import BaseEngine
+from .transformers_server import TransformersServerClient
+from src.utils.config import settings
 
 logger = logging.getLogger(__name__)
 
-try:
-    from transformers import pipeline
-except ImportError:
-    pipeline = None
+# Exported ONNX models are kept here, so the (slow) export runs once per model
+ONNX_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "aws-brief", "onnx")
+
+WARMUP_TEXT = (
+    "Amazon S3 now supports conditional writes. You can use the If-None-Match header "
+    "to check whether an object exists before creating it, without extra API calls."
+)
 
 class TransformersEngine(BaseEngine):
     """
     AI Engine for Local HuggingFace Transformers.
     Ideal for offline summarization without Ollama dependency, but heavy on RAM.
+
+    TRANSFORMERS_BACKEND selects how the model runs on CPU:
+    - pytorch: the plain PyTorch pipeline (default)
+    - int8: PyTorch with dynamic int8 quantization of the linear layers
+    - onnx: ONNX Runtime through optimum (`pip install "optimum[onnxruntime]"`)
+
+    When a `serve-transformers` worker for the same model is running at
+    TRANSFORMERS_SERVER_URL, requests are sent there and no model is loaded
+    in this process.
     """
-    def __init__(self, model: str = "facebook/bart-large-cnn"):
-        if not pipeline:
-             raise ImportError("transformers/torch libraries not installed. Install with `pip install transformers torch`")
-        
-        logger.info(f"Loading local transformer model: {model}. This may take a while...")
+    BACKENDS = ("pytorch", "int8", "onnx")
+    GENERATION_KWARGS = {"max_length": 130, "min_length": 30, "do_sample": False, "truncation": True}
+
+    def __init__(self, model: str = "facebook/bart-large-cnn", backend: str = None, use_server: bool = True):
+        self.model = model
+        self.backend = (backend or settings.TRANSFORMERS_BACKEND).lower()
+        self.summarizer = None
+        self._load_lock = threading.Lock()
+        self.server = TransformersServerClient.connect(model) if use_server else None
+        if self.server is None:
+            self._load()
+
+    def _load(self) -> None:
+        model, backend = self.model, self.backend
+        # torch and transformers take seconds to import, so only load them when the engine is used
+        try:
+            import torch
+            from transformers import pipeline
+        except ImportError:
+            raise ImportError("transformers/torch libraries not installed. Install with `pip install transformers torch`")
+
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown TRANSFORMERS_BACKEND '{backend}', expected one of {', '.join(self.BACKENDS)}")
+
+        threads = settings.TRANSFORMERS_THREADS
+        if threads > 0:
+            # Intra-op parallelism; more threads than physical cores only adds contention
+            torch.set_num_threads(threads)
+
+        logger.info(f"Loading local transformer model: {model} ({backend} backend). This may take a while...")
         try:
             # Check for MPS (Apple Silicon) or CUDA
-            device = 0 if torch.cuda.is_available() else (-1)
+            device = 0 if torch.cuda.is_available() and backend == "pytorch" else (-1)
             if torch.backends.mps.is_available():
                 # device = "mps" # Transformers pipeline support for MPS varies, defaulting to CPU for stability in this demo
                 pass
-            
-            self.summarizer = pipeline("summarization", model=model, device=device)
-            self.model = model
+
+            if backend == "onnx":
+                summarizer = self._load_onnx(model, threads)
+            else:
+                summarizer = pipeline("summarization", model=model, device=device)
+                if backend == "int8":
+                    summarizer.model = torch.ao.quantization.quantize_dynamic(
+                        summarizer.model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
             logger.info("Model loaded successfully.")
         except Exception as e:
             logger.error(f"Failed to load transformer model: {e}")
             raise
 
+        if settings.TRANSFORMERS_WARMUP:
+            # The first call pays for lazy initialisation (kernels, allocator, ORT graph);
+            # pay it at load time instead of on the first real item
+            summarizer(WARMUP_TEXT, **self.GENERATION_KWARGS)
+        # Published only once fully loaded, other threads never see a partial pipeline
+        self.summarizer = summarizer
+
+    @staticmethod
+    def _load_onnx(model: str, threads: int):
+        try:
+            import onnxruntime
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+            from transformers import AutoTokenizer, pipeline
+        except ImportError:
+            raise ImportError('ONNX backend requires optimum. Install with `pip install "optimum[onnxruntime]"`')
+
+        session_options = onnxruntime.SessionOptions()
+        if threads > 0:
+            session_options.intra_op_num_threads = threads
+        session_options.inter_op_num_threads = 1
+
+        export_dir = os.path.join(ONNX_CACHE_DIR, model.replace("/", "--"))
+        if os.path.isdir(export_dir):
+            ort_model = ORTModelForSeq2SeqLM.from_pretrained(export_dir, session_options=session_options)
+            tokenizer = AutoTokenizer.from_pretrained(export_dir)
+        else:
+            logger.info(f"Exporting {model} to ONNX (first use only)...")
+            ort_model = ORTModelForSeq2SeqLM.from_pretrained(model, export=True, session_options=session_options)
+            tokenizer = AutoTokenizer.from_pretrained(model)
+            ort_model.save_pretrained(export_dir)
+            tokenizer.save_pretrained(export_dir)
+        return pipeline("summarization", model=ort_model, tokenizer=tokenizer)
+
+    def _from_server(self, texts: List[str]) -> List[str]:
+        """
+        Summarize through the worker, or return None once it is gone.
+
+        A worker that restarted is reconnected to; otherwise the model is loaded
+        in-process for this and later requests. The worker is only given up
+        once the local model has loaded, so a failed load (e.g. torch not
+        installed next to a worker in another container) is retried against
+        the worker on the next request.
+        """
+        server = self.server
+        if server is None:
+            return None
+        try:
+            return server.summarize_batch(texts)
+        except requests.ConnectionError as e:
+            with self._load_lock:
+                if self.server is server:
+                    reconnected = TransformersServerClient.connect(self.model)
+                    if reconnected is not None:
+                        self.server = reconnected
+                    else:
+                        logger.warning(f"Transformers worker unreachable ({e}), loading the model locally")
+                        if self.summarizer is None:
+                            self._load()
+                        self.server = None
+                server = self.server
+            if server is None:
+                return None
+            return server.summarize_batch(texts)
+
+    def _pipeline(self):
+        summarizer = self.summarizer
+        if summarizer is None:
+            raise RuntimeError(f"Transformers model {self.model} is not loaded and no worker is reachable")
+        return summarizer
+
     def summarize(self, text: str) -> str:
+        summaries = self._from_server([text])
+        if summaries is not None:
+            return summaries[0]
+        summarizer = self._pipeline()
         try:
             logger.info(f"Summarizing text with Local Transformer model: {self.model}")
-            # Truncate to avoid max length errors if text is huge
-            input_text = text[:1024] 
-            
-            summary_list = self.summarizer(input_text, max_length=130, min_length=30, do_sample=False)
+            # Let the tokenizer cut the input at the model's real limit (1024 tokens for BART)
+            summary_list = summarizer(text, **self.GENERATION_KWARGS)
             if summary_list and len(summary_list) > 0:
                 return summary_list[0]['summary_text']
             return "Summary generation failed."
         except Exception as e:
             logger.error(f"Transformer summarization failed: {e}")
             raise
+
+    def summarize_batch(self, texts: List[str]) -> List[str]:
+        summaries = self._from_server(texts)
+        if summaries is not None:
+            return summaries
+        summarizer = self._pipeline()
+        try:
+            logger.info(f"Summarizing {len(texts)} texts with Local Transformer model: {self.model}")
+            # Batches are padded to their longest input, so run similar lengths together
+            order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+            # The pipeline pads and runs up to batch_size inputs per forward pass
+            summary_list = summarizer(
+                [texts[i] for i in order],
+                batch_size=max(1, settings.SUMMARY_BATCH_SIZE),
+                **self.GENERATION_KWARGS
+            )
+            results = [None] * len(texts)
+            for index, summary in zip(order, summary_list):
+                results[index] = summary["summary_text"] if summary else "Summary generation failed."
+            return results
+        except Exception as e:
+            logger.error(f"Transformer batch summarization failed: {e}")
+            raise
+
+    def close(self) -> None:
+        self.server = None
+        if self.summarizer is None:
+            return
+        import torch
+
+        self.summarizer = None
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
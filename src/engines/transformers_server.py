@@ -0,0 +1,253 @@
+"""
+Long-lived inference worker for the local transformers engine.
+
+`python main.py serve-transformers` loads the model once and serves
+summaries over localhost HTTP (TRANSFORMERS_SERVER_URL). Requests arriving
+within TRANSFORMERS_SERVER_BATCH_WAIT_MS of each other are merged into one
+forward pass of up to TRANSFORMERS_SERVER_MAX_BATCH texts (micro-batching).
+While the worker is running, `TransformersEngine` sends its requests there,
+so a short-lived `process-cycle` never pays for loading the model.
+
+Endpoints:
+    GET  /health      {"status": "ready" | "loading", "model": ..., "backend": ...}
+    POST /summarize   {"texts": [...]} -> {"summaries": [...]}
+"""
+import ipaddress
+import json
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from src.utils.config import settings
+from src.utils.http import http_client
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Collects texts from concurrent requests and summarizes them in batches on one thread.
+    """
+    def __init__(self, engine, max_batch: int, max_wait: float):
+        self.engine = engine
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait)
+        self._queue: "queue.Queue[Optional[Tuple[str, Future]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="transformers-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: List[str]) -> List[Future]:
+        futures = []
+        for text in texts:
+            future = Future()
+            self._queue.put((text, future))
+            futures.append(future)
+        return futures
+
+    def stop(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first: Tuple[str, Future]) -> Tuple[List[Tuple[str, Future]], bool]:
+        batch, stopping = [first], False
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                stopping = True
+                break
+            batch.append(item)
+        return batch, stopping
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, stopping = self._collect(first)
+            texts = [text for text, _ in batch]
+            try:
+                if len(texts) == 1:
+                    summaries = [self.engine.summarize(texts[0])]
+                else:
+                    summaries = self.engine.summarize_batch(texts)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), summary in zip(batch, summaries):
+                    future.set_result(summary)
+            if stopping:
+                return
+
+
+class TransformersServer(ThreadingHTTPServer):
+    """
+    HTTP server owning the model and the micro-batcher.
+    """
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], model: str):
+        super().__init__(address, _RequestHandler)
+        self.model = model
+        self.backend = settings.TRANSFORMERS_BACKEND
+        self.batcher: Optional[MicroBatcher] = None
+        self.load_error: Optional[str] = None
+
+    def load(self) -> None:
+        """
+        Load the model; /health reports "loading" until this returns.
+        """
+        from .transformers_client import TransformersEngine
+
+        try:
+            engine = TransformersEngine(model=self.model, use_server=False)
+        except Exception as e:
+            self.load_error = str(e)
+            logger.error(f"Transformers worker failed to load {self.model}: {e}")
+            raise
+        self.batcher = MicroBatcher(
+            engine,
+            settings.TRANSFORMERS_SERVER_MAX_BATCH,
+            settings.TRANSFORMERS_SERVER_BATCH_WAIT_MS / 1000
+        )
+        logger.info(f"Transformers worker ready: {self.model} ({self.backend} backend)")
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server: TransformersServer
+
+    def _send_json(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send_json(404, {"error": "not found"})
+            return
+        if self.server.load_error:
+            status, code = "failed", 500
+        elif self.server.batcher is None:
+            status, code = "loading", 503
+        else:
+            status, code = "ready", 200
+        self._send_json(code, {"status": status, "model": self.server.model, "backend": self.server.backend})
+
+    def do_POST(self):
+        if self.path != "/summarize":
+            self._send_json(404, {"error": "not found"})
+            return
+        if self.server.batcher is None:
+            self._send_json(503, {"error": "model is loading"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            texts = json.loads(self.rfile.read(length) or b"{}").get("texts")
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                raise ValueError("'texts' must be a list of strings")
+        except (ValueError, AttributeError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        try:
+            summaries = [future.result() for future in self.server.batcher.submit(texts)]
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        self._send_json(200, {"summaries": summaries})
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def _server_address(host: Optional[str] = None, port: Optional[int] = None) -> Tuple[str, int]:
+    url = urlparse(settings.TRANSFORMERS_SERVER_URL or "http://127.0.0.1:8765")
+    return host or url.hostname or "127.0.0.1", port or url.port or 8765
+
+
+def serve(model: str, host: Optional[str] = None, port: Optional[int] = None) -> None:
+    """
+    Run the inference worker until interrupted.
+    """
+    address = _server_address(host, port)
+    try:
+        if not ipaddress.ip_address(address[0]).is_loopback:
+            logger.warning(f"Transformers worker listens on {address[0]}, which is reachable from other hosts")
+    except ValueError:
+        pass
+
+    server = TransformersServer(address, model)
+    # Listen first so clients see "loading" instead of a refused connection
+    loader = threading.Thread(target=server.load, name="transformers-loader", daemon=True)
+    loader.start()
+    logger.info(f"Transformers worker listening on http://{address[0]}:{address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if server.batcher is not None:
+            server.batcher.stop()
+
+
+class TransformersServerClient:
+    """
+    Client of a running inference worker, used by `TransformersEngine`.
+    """
+    def __init__(self, url: str, model: str):
+        self.url = url.rstrip("/")
+        self.model = model
+
+    @classmethod
+    def connect(cls, model: str, url: Optional[str] = None) -> Optional["TransformersServerClient"]:
+        """
+        Return a client if a worker serving `model` is running at `url`, None otherwise.
+        A worker that is still loading the model is waited for (up to TRANSFORMERS_SERVER_TIMEOUT).
+        """
+        url = (url or settings.TRANSFORMERS_SERVER_URL).rstrip("/")
+        if not url:
+            return None
+
+        deadline = time.monotonic() + settings.TRANSFORMERS_SERVER_TIMEOUT
+        while True:
+            try:
+                health = http_client.get(f"{url}/health", timeout=2).json()
+            except (requests.RequestException, ValueError):
+                # No worker running: the engine loads the model in-process
+                return None
+
+            if health.get("model") != model:
+                logger.info(f"Transformers worker at {url} serves {health.get('model')}, not {model}; loading locally")
+                return None
+            if health.get("status") == "ready":
+                logger.info(f"Using transformers worker at {url} ({model}, {health.get('backend')} backend)")
+                return cls(url, model)
+            if health.get("status") != "loading" or time.monotonic() > deadline:
+                logger.warning(f"Transformers worker at {url} is not ready ({health.get('status')}); loading locally")
+                return None
+            time.sleep(1)
+
+    def summarize_batch(self, texts: List[str]) -> List[str]:
+        response = http_client.post(
+            f"{self.url}/summarize",
+            json={"texts": texts},
+            timeout=settings.TRANSFORMERS_SERVER_TIMEOUT
+        )
+        response.raise_for_status()
+        return response.json()["summaries"]
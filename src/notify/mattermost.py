@@ -2,6 +2,7 @@ import logging
 import requests
 from .base import BaseNotifier
 from src.utils.config import settings
+from src.utils.http import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -50,7 +51,7 @@ class MattermostNotifier(BaseNotifier):
         }
         
         try:
-            response = requests.post(
+            response = http_client.post(
                 self.webhook_url,
                 json=payload,
                 timeout=10
@@ -1,8 +1,8 @@
 import logging
-import requests
 import json
 from .base import BaseNotifier
 from src.utils.config import settings
+from src.utils.http import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +62,7 @@ class SlackNotifier(BaseNotifier):
         }
 
         try:
-            response = requests.post(
+            response = http_client.post(
                 self.webhook_url, 
                 data=json.dumps(payload),
                 headers={'Content-Type': 'application/json'},
@@ -2,6 +2,7 @@ import logging
 import requests
 from .base import BaseNotifier
 from src.utils.config import settings
+from src.utils.http import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +41,7 @@ class TelegramNotifier(BaseNotifier):
         }
 
         try:
-            response = requests.post(
+            response = http_client.post(
                 f"https://api.telegram.org/bot{self.bot_token}/sendMessage",
                 json=payload,
                 timeout=10
@@ -6,6 +6,7 @@ import json
 from datetime import datetime
 from .base import BaseNotifier
 from src.utils.config import settings
+from src.utils.http import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -59,7 +60,7 @@ class WebhookNotifier(BaseNotifier):
             logger.debug("HMAC signature added to webhook request")
         
         try:
-            response = requests.post(
+            response = http_client.post(
                 self.webhook_url,
                 json=payload,
                 headers=headers,
@@ -11,8 +11,43 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = Field("INFO", env="LOG_LEVEL")
     DB_URL: str = Field("sqlite:///aws_brief.db", env="DB_URL")
 
+    # HTTP Transport (shared by scraper and notifiers)
+    HTTP_POOL_CONNECTIONS: int = Field(10, env="HTTP_POOL_CONNECTIONS")
+    HTTP_POOL_MAXSIZE: int = Field(10, env="HTTP_POOL_MAXSIZE")
+    HTTP_TIMEOUT: float = Field(30.0, env="HTTP_TIMEOUT")
+    HTTP2_ENABLED: bool = Field(False, env="HTTP2_ENABLED")
+
+    # Scanning
+    SCAN_CONCURRENCY: int = Field(8, env="SCAN_CONCURRENCY")
+    SCAN_PARSE_PROCESSES: int = Field(0, env="SCAN_PARSE_PROCESSES")
+    SCRAPER_RATE_PER_HOST: float = Field(2.0, env="SCRAPER_RATE_PER_HOST")
+    SCRAPER_BURST: int = Field(4, env="SCRAPER_BURST")
+    SANITIZER_ENGINE: str = Field("auto", env="SANITIZER_ENGINE")
+    FEED_FIXTURE_MODE: str = Field("off", env="FEED_FIXTURE_MODE")
+    FEED_FIXTURE_DIR: str = Field("fixtures/feeds", env="FEED_FIXTURE_DIR")
+    FEED_REPLAY_LATENCY_MS: float = Field(0, env="FEED_REPLAY_LATENCY_MS")
+
+    # Adaptive Polling
+    ADAPTIVE_POLLING: bool = Field(True, env="ADAPTIVE_POLLING")
+    FEED_MIN_POLL_INTERVAL: int = Field(60, env="FEED_MIN_POLL_INTERVAL")
+    FEED_MAX_POLL_INTERVAL: int = Field(86400, env="FEED_MAX_POLL_INTERVAL")
+    FEED_DEFAULT_POLL_INTERVAL: int = Field(900, env="FEED_DEFAULT_POLL_INTERVAL")
+    FEED_POLL_FACTOR: float = Field(0.25, env="FEED_POLL_FACTOR")
+
     # AI Engines
     OLLAMA_HOST: str = Field("http://localhost:11434", env="OLLAMA_HOST")
+    OLLAMA_KEEP_ALIVE: str = Field("30m", env="OLLAMA_KEEP_ALIVE")
+    OLLAMA_NUM_CTX: int = Field(0, env="OLLAMA_NUM_CTX")
+    OLLAMA_MAX_CTX: int = Field(16384, env="OLLAMA_MAX_CTX")
+    OLLAMA_NUM_PARALLEL: int = Field(4, env="OLLAMA_NUM_PARALLEL")
+    OLLAMA_PREWARM: bool = Field(True, env="OLLAMA_PREWARM")
+    TRANSFORMERS_BACKEND: str = Field("pytorch", env="TRANSFORMERS_BACKEND")
+    TRANSFORMERS_THREADS: int = Field(0, env="TRANSFORMERS_THREADS")
+    TRANSFORMERS_WARMUP: bool = Field(True, env="TRANSFORMERS_WARMUP")
+    TRANSFORMERS_SERVER_URL: str = Field("http://127.0.0.1:8765", env="TRANSFORMERS_SERVER_URL")
+    TRANSFORMERS_SERVER_TIMEOUT: float = Field(120.0, env="TRANSFORMERS_SERVER_TIMEOUT")
+    TRANSFORMERS_SERVER_MAX_BATCH: int = Field(8, env="TRANSFORMERS_SERVER_MAX_BATCH")
+    TRANSFORMERS_SERVER_BATCH_WAIT_MS: float = Field(20.0, env="TRANSFORMERS_SERVER_BATCH_WAIT_MS")
     OPENAI_API_KEY: SecretStr | None = Field(None, env="OPENAI_API_KEY")
     ANTHROPIC_API_KEY: SecretStr | None = Field(None, env="ANTHROPIC_API_KEY")
     GOOGLE_API_KEY: SecretStr | None = Field(None, env="GOOGLE_API_KEY")
@@ -25,12 +60,29 @@ class Settings(BaseSettings):
     DEFAULT_AI_MODEL: str = Field("llama2", env="DEFAULT_AI_MODEL")
     DEFAULT_NOTIFY_CHANNELS: str = Field("slack", env="DEFAULT_NOTIFY_CHANNELS")
     SUMMARY_LANGUAGE: str = Field("English", env="SUMMARY_LANGUAGE")
+    AI_CONTEXT_TOKENS: int = Field(0, env="AI_CONTEXT_TOKENS")
+
+    # Summary Cache
+    SUMMARY_CACHE_ENABLED: bool = Field(True, env="SUMMARY_CACHE_ENABLED")
+    SUMMARY_CACHE_MAX_ENTRIES: int = Field(5000, env="SUMMARY_CACHE_MAX_ENTRIES")
+    SUMMARY_CACHE_MAX_AGE_DAYS: int = Field(90, env="SUMMARY_CACHE_MAX_AGE_DAYS")
     
     # AI Rate Limiting
     AI_RATE_LIMIT_CALLS: int = Field(50, env="AI_RATE_LIMIT_CALLS")
     AI_RATE_LIMIT_PERIOD: int = Field(60, env="AI_RATE_LIMIT_PERIOD")
     AI_MAX_RETRIES: int = Field(3, env="AI_MAX_RETRIES")
     AI_RETRY_DELAY: int = Field(2, env="AI_RETRY_DELAY")
+    AI_FALLBACK_ENGINES: str = Field("", env="AI_FALLBACK_ENGINES")
+    AI_CIRCUIT_FAILURES: int = Field(5, env="AI_CIRCUIT_FAILURES")
+    AI_CIRCUIT_RESET: int = Field(60, env="AI_CIRCUIT_RESET")
+    AI_HEDGE_ENGINE: str = Field("", env="AI_HEDGE_ENGINE")
+    AI_HEDGE_PERCENTILE: float = Field(95.0, env="AI_HEDGE_PERCENTILE")
+    AI_HEDGE_DELAY: float = Field(10.0, env="AI_HEDGE_DELAY")
+    AI_HEDGE_MIN_SAMPLES: int = Field(20, env="AI_HEDGE_MIN_SAMPLES")
+    SUMMARY_WORKERS: int = Field(4, env="SUMMARY_WORKERS")
+    SUMMARY_BATCH_SIZE: int = Field(5, env="SUMMARY_BATCH_SIZE")
+    SUMMARY_BATCH_MAX_CHARS: int = Field(4000, env="SUMMARY_BATCH_MAX_CHARS")
+    STRUCTURED_OUTPUT: bool = Field(False, env="STRUCTURED_OUTPUT")
     
     # Notifications
     SLACK_WEBHOOK_URL: SecretStr | None = Field(None, env="SLACK_WEBHOOK_URL")
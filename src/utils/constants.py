@@ -1,8 +1,9 @@
 # AWS Official Feeds
+# Optional "priority" overrides the adaptive poll interval: "high" = FEED_MIN_POLL_INTERVAL, "low" = FEED_MAX_POLL_INTERVAL
 AWS_FEEDS = [
     # General & News
     {"name": "AWS What's New", "url": "https://aws.amazon.com/about-aws/whats-new/recent/feed/"},
-    {"name": "AWS Security Bulletins", "url": "https://aws.amazon.com/security/security-bulletins/feed/"},
+    {"name": "AWS Security Bulletins", "url": "https://aws.amazon.com/security/security-bulletins/feed/", "priority": "high"},
     {"name": "AWS Podcast", "url": "https://aws.amazon.com/podcasts/aws-podcast/"},
 
     # Core Infrastructure
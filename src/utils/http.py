@@ -0,0 +1,135 @@
+"""
+Shared HTTP transport for the scraper and all notifiers.
+
+A single client keeps keep-alive connection pools per host, so repeated
+requests to the same webhook or feed host reuse TCP/TLS connections instead
+of paying a new handshake every time.
+
+Responses are always `requests.Response` objects and transport failures are
+always `requests.RequestException`, whichever backend is active.
+"""
+import logging
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from src.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import httpx
+    import h2  # noqa: F401 - required by httpx for HTTP/2
+except ImportError:
+    httpx = None
+
+
+class HttpClient:
+    """
+    Thread-safe pooled HTTP client.
+
+    Uses a `requests.Session` with sized connection pools by default, or an
+    `httpx.Client` with HTTP/2 when enabled and `httpx[http2]` is installed.
+    """
+    def __init__(
+        self,
+        pool_connections: int = settings.HTTP_POOL_CONNECTIONS,
+        pool_maxsize: int = settings.HTTP_POOL_MAXSIZE,
+        timeout: float = settings.HTTP_TIMEOUT,
+        http2: bool = settings.HTTP2_ENABLED
+    ):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._httpx_client = None
+        self._session = None
+
+        if http2 and httpx is None:
+            logger.warning("HTTP/2 requested but httpx[http2] is not installed. Falling back to HTTP/1.1.")
+            http2 = False
+
+        if http2:
+            self._httpx_client = httpx.Client(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=pool_connections * pool_maxsize,
+                    max_keepalive_connections=pool_maxsize
+                ),
+                timeout=timeout,
+                follow_redirects=True
+            )
+        else:
+            adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+            self._session = requests.Session()
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+
+    @property
+    def http2(self) -> bool:
+        return self._httpx_client is not None
+
+    def request(self, method: str, url: str, timeout: Optional[float] = None, **kwargs) -> requests.Response:
+        """
+        Send a request through the shared connection pool.
+
+        Args:
+            method: HTTP method
+            url: Target URL
+            timeout: Request timeout in seconds (default: HTTP_TIMEOUT)
+            **kwargs: `headers`, `data`, `json` or `params`, as in `requests`
+
+        Returns:
+            requests.Response
+        """
+        timeout = timeout or self.timeout
+        if self._httpx_client is not None:
+            return self._httpx_request(method, url, timeout, **kwargs)
+        return self._session.request(method, url, timeout=timeout, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        """
+        Close all pooled connections.
+        """
+        with self._lock:
+            if self._httpx_client is not None:
+                self._httpx_client.close()
+            if self._session is not None:
+                self._session.close()
+
+    def _httpx_request(self, method: str, url: str, timeout: float, **kwargs) -> requests.Response:
+        # httpx takes raw bodies as `content`, `data` is reserved for form fields
+        data = kwargs.pop("data", None)
+        if isinstance(data, (str, bytes)):
+            kwargs["content"] = data
+        elif data is not None:
+            kwargs["data"] = data
+
+        try:
+            response = self._httpx_client.request(method, url, timeout=timeout, **kwargs)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.RequestException(str(e)) from e
+
+        # Present httpx responses as requests responses so callers stay backend-agnostic
+        converted = requests.Response()
+        converted.status_code = response.status_code
+        converted.headers = CaseInsensitiveDict(response.headers)
+        converted._content = response.content
+        converted.encoding = response.encoding
+        converted.reason = response.reason_phrase
+        converted.url = str(response.url)
+        return converted
+
+
+http_client = HttpClient()
@@ -4,8 +4,16 @@ Centralized prompt templates for AI engines.
 This module provides consistent, high-quality prompts for all AI engines
 to ensure uniform output quality and structure.
 """
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
 from src.utils.config import settings
 
+# Bump whenever a prompt below changes, so cached summaries produced by the
+# previous wording are not reused (see src/core/summary_cache.py)
+PROMPT_VERSION = "2"
+
 
 def get_system_prompt() -> str:
     """
@@ -24,19 +32,8 @@ def get_system_prompt() -> str:
 Your task is to analyze AWS updates and provide actionable insights that help teams make informed decisions."""
 
 
-def get_summarize_prompt(text: str) -> str:
-    """
-    Get the summarization prompt for a given AWS update text.
-    
-    Args:
-        text: The AWS update text to analyze
-        
-    Returns:
-        Formatted prompt string with structure and guidelines
-    """
-    return f"""Analyze this AWS update with precision and provide actionable insights:
-
-**Required Structure**:
+# Shared by the single-item and batch summarization prompts
+SUMMARY_GUIDE = """**Required Structure**:
 1. **Title**: Punchy 5-8 words capturing core value
 2. **What**: 2-3 sentences explaining the technical change
 3. **Why**: Business/technical impact (cost savings? security improvement? performance boost?)
@@ -63,11 +60,292 @@ def get_summarize_prompt(text: str) -> str:
 
 ---
 
+"""
+
+BATCH_ITEM_MARKER = "=== ITEM {index} ==="
+_BATCH_ITEM_PATTERN = re.compile(r"^[ \t]*=+[ \t]*ITEM[ \t]+(\d+)[ \t]*=+[ \t]*$", re.MULTILINE)
+
+
+def get_summarize_prefix() -> str:
+    """
+    Get the static head of the summarization prompts.
+
+    It is identical for every single-item and batch request, so it is sent
+    first and providers can serve it from their prompt cache (see
+    `split_cacheable_prefix`). Keep anything request-specific out of it.
+    
+    Returns:
+        Instructions, required structure and worked example
+    """
+    return f"""Analyze AWS updates with precision and provide actionable insights:
+
+{SUMMARY_GUIDE}"""
+
+
+def split_cacheable_prefix(user: str) -> Tuple[str, str]:
+    """
+    Split a user prompt into its static, cacheable prefix and the request-specific rest.
+    
+    Args:
+        user: User prompt built by this module
+        
+    Returns:
+        (prefix, rest); the prefix is empty for prompts without the static head
+    """
+    prefix = get_summarize_prefix()
+    if user.startswith(prefix):
+        return prefix, user[len(prefix):]
+    return "", user
+
+
+def get_summarize_prompt(text: str) -> str:
+    """
+    Get the summarization prompt for a given AWS update text.
+    
+    Args:
+        text: The AWS update text to analyze
+        
+    Returns:
+        Formatted prompt string with structure and guidelines
+    """
+    return f"""{get_summarize_prefix()}**Now analyze this AWS update**:
+{text}
+"""
+
+
+def get_batch_summarize_prompt(texts: List[str]) -> str:
+    """
+    Get a prompt that summarizes several AWS updates in one request.
+
+    Each update is analyzed independently with the single-item structure; the
+    answers are delimited by item markers so `split_batch_response` can map
+    them back to their inputs.
+    
+    Args:
+        texts: The AWS update texts to analyze
+        
+    Returns:
+        Formatted prompt string
+    """
+    updates = "\n\n".join(
+        f"{BATCH_ITEM_MARKER.format(index=i)}\n{text}" for i, text in enumerate(texts, 1)
+    )
+    return f"""{get_summarize_prefix()}**Now analyze each of the following {len(texts)} AWS updates independently**.
+
+For EVERY update, start your answer with its marker line exactly as given (e.g. `{BATCH_ITEM_MARKER.format(index=1)}`), then write the analysis. Never merge or skip updates. Answer them in order.
+
+{updates}
+"""
+
+
+def split_batch_response(response: str, count: int) -> Dict[int, str]:
+    """
+    Split a batch response into per-item summaries.
+    
+    Args:
+        response: Raw model output for a `get_batch_summarize_prompt` prompt
+        count: Number of items in the batch
+        
+    Returns:
+        Mapping of 0-based item position to summary. Items the model skipped
+        or left empty are missing from the mapping.
+    """
+    matches = list(_BATCH_ITEM_PATTERN.finditer(response or ""))
+    summaries = {}
+    for i, match in enumerate(matches):
+        position = int(match.group(1)) - 1
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(response)
+        summary = response[match.end():end].strip().rstrip("-").strip()
+        if 0 <= position < count and summary and position not in summaries:
+            summaries[position] = summary
+    return summaries
+
+
+IMPACT_LEVELS = ["CRITICAL", "HIGH", "MEDIUM", "LOW", "INFO"]
+
+# JSON shape of one summary in structured-output mode (STRUCTURED_OUTPUT)
+SUMMARY_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "what": {"type": "string"},
+        "why": {"type": "string"},
+        "impact_level": {"type": "string", "enum": IMPACT_LEVELS},
+        "action_required": {"type": "boolean"},
+        "action": {"type": "string"},
+    },
+    "required": ["title", "what", "why", "impact_level", "action_required", "action"],
+    "additionalProperties": False,
+}
+
+BATCH_SUMMARY_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "summaries": {
+            "type": "array",
+            "items": {
+                **SUMMARY_SCHEMA,
+                "properties": {"index": {"type": "integer"}, **SUMMARY_SCHEMA["properties"]},
+                "required": ["index"] + SUMMARY_SCHEMA["required"],
+            },
+        },
+    },
+    "required": ["summaries"],
+    "additionalProperties": False,
+}
+
+_JSON_FIELDS = """Respond with JSON only, no Markdown around it. Fill the fields with the content of the Required Structure:
+- "title", "what", "why": strings
+- "impact_level": exactly one of """ + ", ".join(IMPACT_LEVELS) + """
+- "action_required": true or false
+- "action": the brief action if action_required is true, otherwise an empty string"""
+
+_IMPACT_PATTERN = re.compile(
+    r"impact[ _]level\W*?[:\-]\W*(" + "|".join(IMPACT_LEVELS) + r")\b", re.IGNORECASE
+)
+_ACTION_PATTERN = re.compile(r"action[ _]required\W*?[:\-]\W*(yes|no|true|false)\b", re.IGNORECASE)
+
+
+def get_structured_summarize_prompt(text: str) -> str:
+    """
+    Get the structured-output variant of `get_summarize_prompt` (answer as SUMMARY_SCHEMA JSON).
+    
+    Args:
+        text: The AWS update text to analyze
+        
+    Returns:
+        Formatted prompt string
+    """
+    return f"""{get_summarize_prefix()}**Output**: {_JSON_FIELDS}
+
 **Now analyze this AWS update**:
 {text}
 """
 
 
+def get_structured_batch_summarize_prompt(texts: List[str]) -> str:
+    """
+    Get the structured-output variant of `get_batch_summarize_prompt` (answer as BATCH_SUMMARY_SCHEMA JSON).
+    
+    Args:
+        texts: The AWS update texts to analyze
+        
+    Returns:
+        Formatted prompt string
+    """
+    updates = "\n\n".join(
+        f"{BATCH_ITEM_MARKER.format(index=i)}\n{text}" for i, text in enumerate(texts, 1)
+    )
+    return f"""{get_summarize_prefix()}**Output**: {_JSON_FIELDS}
+
+Return {{"summaries": [...]}} with one object per update, each with an additional "index" field holding the update's ITEM number. Never merge or skip updates.
+
+**Now analyze each of the following {len(texts)} AWS updates independently**:
+
+{updates}
+"""
+
+
+def _load_json(response: str) -> Optional[Any]:
+    """
+    Parse JSON from a model response, tolerating code fences and text around it.
+    """
+    text = (response or "").strip()
+    if text.startswith("```"):
+        text = re.sub(r"^```[a-zA-Z]*\s*|\s*```$", "", text)
+    for candidate in (text, text[text.find("{"):text.rfind("}") + 1]):
+        try:
+            return json.loads(candidate)
+        except ValueError:
+            continue
+    return None
+
+
+def render_summary(fields: Dict[str, Any]) -> str:
+    """
+    Render structured summary fields as the Markdown produced in free-text mode.
+    """
+    action = "Yes" if fields.get("action_required") else "No"
+    if fields.get("action_required") and fields.get("action"):
+        action += f" - {fields['action']}"
+    return (
+        f"**Title**: {fields.get('title', '')}\n\n"
+        f"**What**: {fields.get('what', '')}\n\n"
+        f"**Why**: {fields.get('why', '')}\n\n"
+        f"**Impact Level**: {str(fields.get('impact_level', '')).upper()}\n\n"
+        f"**Action Required**: {action}"
+    )
+
+
+def parse_structured_response(response: str) -> str:
+    """
+    Turn a structured-output response into the summary Markdown.
+
+    Falls back to the raw response when it is not the expected JSON, so the
+    summary is never lost; `parse_summary_fields` still reads what it can.
+    """
+    fields = _load_json(response)
+    if isinstance(fields, dict) and "impact_level" in fields:
+        return render_summary(fields)
+    return response
+
+
+def split_structured_batch_response(response: str, count: int) -> Dict[int, str]:
+    """
+    Split a structured-output batch response into per-item summaries.
+    
+    Returns:
+        Mapping of 0-based item position to summary Markdown, like `split_batch_response`
+    """
+    data = _load_json(response)
+    entries = data.get("summaries") if isinstance(data, dict) else data
+    summaries = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict) or "impact_level" not in entry:
+            continue
+        try:
+            position = int(entry.get("index")) - 1
+        except (TypeError, ValueError):
+            continue
+        if 0 <= position < count and position not in summaries:
+            summaries[position] = render_summary(entry)
+    return summaries
+
+
+def parse_summary_fields(summary: Optional[str]) -> Dict[str, Any]:
+    """
+    Extract the impact level and action flag from a summary.
+
+    Tolerant of Markdown variations (bold or plain labels, brackets, "Yes - ..."),
+    and of raw JSON answers. Fields that cannot be found are None.
+    
+    Args:
+        summary: Summary text in any of the formats above
+        
+    Returns:
+        {"impact_level": "HIGH" | ... | None, "action_required": True | False | None}
+    """
+    fields = {"impact_level": None, "action_required": None}
+    if not summary:
+        return fields
+
+    data = _load_json(summary) if "{" in summary else None
+    if isinstance(data, dict):
+        level = str(data.get("impact_level", "")).upper()
+        fields["impact_level"] = level if level in IMPACT_LEVELS else None
+        if isinstance(data.get("action_required"), bool):
+            fields["action_required"] = data["action_required"]
+        return fields
+
+    impact = _IMPACT_PATTERN.search(summary)
+    if impact:
+        fields["impact_level"] = impact.group(1).upper()
+    action = _ACTION_PATTERN.search(summary)
+    if action:
+        fields["action_required"] = action.group(1).lower() in ("yes", "true")
+    return fields
+
+
 def get_smart_digest_prompt(items_text: str) -> str:
     """
     Get the smart digest prompt for categorizing and prioritizing multiple AWS updates.
@@ -146,6 +424,31 @@ def get_smart_digest_prompt(items_text: str) -> str:
 """
 
 
+def get_digest_map_prompt(group: str, items_text: str) -> str:
+    """
+    Get the prompt condensing one chunk of digest items (map step of the digest pipeline).
+
+    Args:
+        group: Category or feed the items belong to
+        items_text: The chunk's items, one per line or block
+
+    Returns:
+        Formatted prompt string whose answer feeds the final digest prompt
+    """
+    return f"""Condense the following AWS updates from "{group}" into notes for a digest.
+
+**Updates**:
+{items_text}
+
+**Rules**:
+- Keep EVERY update: one line per update, never merge or skip updates
+- Line format: - [Title]: [Key change] | [Action, deadline or savings, if any]
+- Keep version numbers, regions, dates and percentages exactly as given
+- No introduction, headings or closing remarks
+- Language: {settings.SUMMARY_LANGUAGE}
+"""
+
+
 # Helper function for backward compatibility
 def format_prompt_for_engine(text: str, engine_type: str = "generic") -> dict:
     """
@@ -0,0 +1,153 @@
+"""
+Thread-safe rate limiting primitives.
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+
+class TokenBucket:
+    """
+    Token bucket allowing `rate` requests per second with bursts up to `capacity`.
+
+    Requests within budget are granted immediately. A bucket can also be
+    blocked for a fixed period (e.g. to honor a server's Retry-After header).
+    """
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        # Point in time from which tokens accrue. Lies in the future while blocked.
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Reserve one token.
+
+        Returns:
+            Seconds the caller must wait before using the token (0 if within budget)
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.rate <= 0:
+                # Unlimited, but a block (Retry-After) still applies
+                return max(0.0, self._updated - now)
+            self._refill(now)
+            self._tokens -= 1
+            wait = max(0.0, self._updated - now)
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            return wait
+
+    def acquire(self) -> float:
+        """
+        Block until a token is available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def block(self, seconds: float) -> None:
+        """
+        Stop granting tokens for the given number of seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            until = now + seconds
+            if until > self._updated:
+                self._updated = until
+                self._tokens = min(self._tokens, 1.0)
+
+
+class HostRateLimiter:
+    """
+    Per-host politeness scheduler built on one TokenBucket per host.
+    """
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, host: str) -> float:
+        """
+        Wait until a request to `host` is within budget.
+
+        Returns:
+            Seconds spent waiting
+        """
+        return self._bucket(host).acquire()
+
+    def defer(self, host: str, seconds: float) -> None:
+        """
+        Pause all requests to `host` for the given number of seconds.
+        """
+        self._bucket(host).block(seconds)
+
+
+class SlidingWindowRateLimiter:
+    """
+    Allows at most `calls` acquisitions in any rolling window of `period` seconds.
+
+    Shared by worker threads: each caller reserves the earliest free slot under
+    the lock and then sleeps outside it, so waiting threads are released one
+    slot at a time instead of all at once when the window frees up.
+    """
+    def __init__(self, calls: int, period: float):
+        self.calls = calls
+        self.period = period
+        self._granted = deque()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Reserve one call slot.
+
+        Returns:
+            Seconds the caller must wait before making the call (0 if within budget)
+        """
+        if self.calls <= 0 or self.period <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            while self._granted and self._granted[0] <= now - self.period:
+                self._granted.popleft()
+            slot = now
+            if len(self._granted) >= self.calls:
+                # Free once the call `calls` positions back has left the window
+                slot = max(now, self._granted[-self.calls] + self.period)
+            self._granted.append(slot)
+            return slot - now
+
+    def acquire(self) -> float:
+        """
+        Block until a call is within budget.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
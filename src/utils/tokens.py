@@ -0,0 +1,247 @@
+"""
+Token-aware input budgeting.
+
+Counts tokens with tiktoken when it is installed (exact for OpenAI models, a
+close approximation for others) and with a calibrated character estimator
+otherwise, and knows the context/output limits of the models we support, so
+prompts can be trimmed per item to fit instead of being cut at an arbitrary
+character offset.
+"""
+import logging
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# (context window, max output tokens), matched by longest model-name prefix
+MODEL_LIMITS: Dict[str, Tuple[int, int]] = {
+    "gpt-4o": (128000, 16384),
+    "gpt-4.1": (1047576, 32768),
+    "gpt-4-turbo": (128000, 4096),
+    "gpt-4": (8192, 4096),
+    "gpt-3.5-turbo": (16385, 4096),
+    "o1": (200000, 100000),
+    "o3": (200000, 100000),
+    "o4": (200000, 100000),
+    "claude": (200000, 8192),
+    "gemini-1.5": (1048576, 8192),
+    "gemini-2": (1048576, 8192),
+    "gemini": (32768, 8192),
+    "mixtral-8x7b": (32768, 4096),
+    "llama-3.1": (131072, 8192),
+    "llama-3.3": (131072, 32768),
+    "llama3.1": (131072, 4096),
+    "llama3.2": (131072, 4096),
+    "llama3.3": (131072, 4096),
+    "llama3": (8192, 4096),
+    "llama2": (4096, 2048),
+    "mistral-large": (131072, 8192),
+    "mistral": (32768, 4096),
+    "deepseek": (65536, 8192),
+    "facebook/bart-large-cnn": (1024, 142),
+}
+DEFAULT_LIMITS = (8192, 2048)
+
+# Output reserved per item summary ("Maximum 200 words" plus markdown)
+SUMMARY_OUTPUT_TOKENS = 400
+
+# Average characters per token of English prose for BPE tokenizers, rounded
+# down so the estimate errs on the side of more tokens
+CHARS_PER_TOKEN = 3.5
+
+
+def get_model_limits(model: Optional[str], engine: Optional[str] = None) -> Tuple[int, int]:
+    """
+    Return (context window, max output tokens) of a model.
+
+    AI_CONTEXT_TOKENS overrides the context window (e.g. for an Ollama
+    server configured with a smaller num_ctx). Models served by a local
+    Ollama (`engine="ollama"`) are capped at OLLAMA_MAX_CTX, since the
+    server allocates the KV cache for the whole window it is asked for.
+    """
+    name = (model or "").lower()
+    matches = [prefix for prefix in MODEL_LIMITS if name.startswith(prefix)]
+    context, output = MODEL_LIMITS[max(matches, key=len)] if matches else DEFAULT_LIMITS
+    if settings.AI_CONTEXT_TOKENS:
+        context = settings.AI_CONTEXT_TOKENS
+    elif (engine or "").lower() == "ollama" and settings.OLLAMA_MAX_CTX > 0:
+        context = min(context, settings.OLLAMA_MAX_CTX)
+    return context, min(output, context // 2)
+
+
+class TokenCounter:
+    """
+    Counts and truncates text in tokens of a given model.
+    """
+    _encodings: Dict[str, object] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, model: Optional[str] = None):
+        self.model = model
+        self.encoding = self._encoding_for(model)
+
+    @classmethod
+    def _encoding_for(cls, model: Optional[str]):
+        if tiktoken is None:
+            return None
+        key = model or ""
+        with cls._lock:
+            if key not in cls._encodings:
+                try:
+                    try:
+                        encoding = tiktoken.encoding_for_model(model or "")
+                    except KeyError:
+                        # Non-OpenAI models: a modern BPE vocabulary is a close approximation
+                        encoding = tiktoken.get_encoding("o200k_base")
+                except Exception as e:
+                    # e.g. the vocabulary cannot be downloaded on an offline host
+                    logger.debug(f"tiktoken unavailable ({e}), estimating tokens")
+                    encoding = None
+                cls._encodings[key] = encoding
+            return cls._encodings[key]
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+    def truncate(self, text: str, max_tokens: int, suffix: str = "…") -> str:
+        """
+        Trim text to at most `max_tokens` tokens, appending `suffix` when cut.
+        """
+        if max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+        # Leave room for the suffix
+        keep = max(0, max_tokens - self.count(suffix))
+        if self.encoding is not None:
+            tokens = self.encoding.encode(text, disallowed_special=())
+            return self.encoding.decode(tokens[:keep]).rstrip() + suffix
+        return text[:int(keep * CHARS_PER_TOKEN)].rstrip() + suffix
+
+
+def input_budget(
+    model: Optional[str],
+    counter: TokenCounter,
+    overhead: str = "",
+    output_tokens: Optional[int] = None,
+    engine: Optional[str] = None
+) -> int:
+    """
+    Tokens available for content in a prompt.
+
+    Args:
+        model: Target model
+        counter: Token counter of the model
+        overhead: Fixed prompt text sent along with the content (instructions, system prompt)
+        output_tokens: Tokens reserved for the answer (default: the model's output limit)
+        engine: Engine serving the model (see `get_model_limits`)
+
+    Returns:
+        Token budget for the content
+    """
+    context, max_output = get_model_limits(model, engine)
+    reserved = max_output if output_tokens is None else output_tokens
+    return max(0, context - reserved - counter.count(overhead))
+
+
+def fit_items(
+    texts: List[str],
+    budget: int,
+    counter: TokenCounter,
+    min_tokens: int = 32,
+    max_tokens: Optional[int] = None
+) -> Tuple[List[str], int]:
+    """
+    Fit item texts into a shared token budget.
+
+    Short items are kept whole and the remaining budget is split evenly
+    between the longer ones (water-filling), so one long item cannot crowd
+    out the rest. If the budget cannot give every item `min_tokens`, the
+    trailing items are dropped; callers should pass items in priority order
+    and report the dropped count.
+
+    Args:
+        texts: Item texts in priority order
+        budget: Total tokens available
+        counter: Token counter of the target model
+        min_tokens: Smallest useful share per item
+        max_tokens: Optional cap per item
+
+    Returns:
+        (fitted texts, number of dropped items)
+    """
+    keep = len(texts)
+    if min_tokens > 0:
+        keep = min(keep, budget // min_tokens)
+    kept = texts[:keep]
+    dropped = len(texts) - keep
+
+    sizes = [counter.count(text) for text in kept]
+    if max_tokens:
+        sizes = [min(size, max_tokens) for size in sizes]
+
+    # Water-filling: find the per-item cap that spends the budget exactly
+    remaining, open_items = budget, len(sizes)
+    cap = max_tokens or budget
+    for size in sorted(sizes):
+        share = remaining // open_items if open_items else 0
+        if size > share:
+            cap = share
+            break
+        remaining -= size
+        open_items -= 1
+
+    fitted = [counter.truncate(text, min(size, cap)) for text, size in zip(kept, sizes)]
+    return fitted, dropped
+
+
+class TokenUsage:
+    """
+    Process-wide prompt token counters per provider ("engine/model").
+
+    Engines record the input tokens each request was billed for and how many
+    of them were served from the provider's prompt cache, so the effect of
+    prompt-prefix caching is visible in the logs.
+    """
+    def __init__(self):
+        self._usage: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, input_tokens: int, cached_tokens: int = 0) -> None:
+        with self._lock:
+            usage = self._usage.setdefault(provider, {"requests": 0, "input_tokens": 0, "cached_tokens": 0})
+            usage["requests"] += 1
+            usage["input_tokens"] += input_tokens or 0
+            usage["cached_tokens"] += cached_tokens or 0
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {provider: dict(usage) for provider, usage in self._usage.items()}
+
+    def log_summary(self) -> None:
+        """
+        Log cached vs uncached input tokens per provider.
+        """
+        for provider, usage in self.snapshot().items():
+            cached = usage["cached_tokens"]
+            uncached = usage["input_tokens"] - cached
+            share = cached / usage["input_tokens"] * 100 if usage["input_tokens"] else 0
+            logger.info(
+                f"Prompt tokens for {provider}: {usage['requests']} requests, "
+                f"{cached} cached, {uncached} uncached ({share:.0f}% from cache)"
+            )
+
+
+token_usage = TokenUsage()
@@ -0,0 +1,103 @@
+import json
+
+from src.utils.prompts import parse_summary_fields, split_batch_response, split_structured_batch_response
+
+
+def _batch(*parts):
+    return "\n".join(f"=== ITEM {index} ===\n{text}" for index, text in parts)
+
+
+class TestSplitBatchResponse:
+    def test_splits_items_in_order(self):
+        response = _batch((1, "first"), (2, "second"), (3, "third"))
+        assert split_batch_response(response, 3) == {0: "first", 1: "second", 2: "third"}
+
+    def test_maps_reordered_items_by_marker(self):
+        response = _batch((2, "second"), (1, "first"))
+        assert split_batch_response(response, 2) == {0: "first", 1: "second"}
+
+    def test_missing_item_is_left_out(self):
+        response = _batch((1, "first"), (3, "third"))
+        assert split_batch_response(response, 3) == {0: "first", 2: "third"}
+
+    def test_empty_item_is_left_out(self):
+        response = _batch((1, ""), (2, "second"))
+        assert split_batch_response(response, 2) == {1: "second"}
+
+    def test_duplicated_marker_keeps_first_answer(self):
+        response = _batch((1, "first"), (1, "again"), (2, "second"))
+        assert split_batch_response(response, 2) == {0: "first", 1: "second"}
+
+    def test_out_of_range_markers_are_ignored(self):
+        response = _batch((0, "zero"), (1, "first"), (7, "seventh"))
+        assert split_batch_response(response, 2) == {0: "first"}
+
+    def test_tolerates_marker_spacing_and_separators(self):
+        response = "Intro text\n  ==  ITEM 1 ==\nfirst\n---\n=== ITEM 2 ===  \nsecond\n"
+        assert split_batch_response(response, 2) == {0: "first", 1: "second"}
+
+    def test_marker_inside_a_line_is_not_a_split(self):
+        response = _batch((1, "see === ITEM 2 === below"))
+        assert split_batch_response(response, 2) == {0: "see === ITEM 2 === below"}
+
+    def test_no_markers_or_no_response(self):
+        assert split_batch_response("a plain answer", 2) == {}
+        assert split_batch_response("", 2) == {}
+        assert split_batch_response(None, 2) == {}
+
+
+class TestParseSummaryFields:
+    def test_markdown_summary(self):
+        summary = "**Title**: t\n\n**Impact Level**: HIGH\n\n**Action Required**: Yes - Audit databases"
+        assert parse_summary_fields(summary) == {"impact_level": "HIGH", "action_required": True}
+
+    def test_plain_labels_brackets_and_lowercase(self):
+        summary = "Impact Level: [medium]\nAction Required: no"
+        assert parse_summary_fields(summary) == {"impact_level": "MEDIUM", "action_required": False}
+
+    def test_numbered_bold_values(self):
+        summary = "4. **Impact Level**: **CRITICAL**\n5. **Action Required**: **Yes** - patch now"
+        assert parse_summary_fields(summary) == {"impact_level": "CRITICAL", "action_required": True}
+
+    def test_json_answer_in_code_fence(self):
+        summary = '```json\n{"impact_level": "low", "action_required": false}\n```'
+        assert parse_summary_fields(summary) == {"impact_level": "LOW", "action_required": False}
+
+    def test_json_with_unknown_level_and_non_boolean_flag(self):
+        summary = '{"impact_level": "SEVERE", "action_required": "yes"}'
+        assert parse_summary_fields(summary) == {"impact_level": None, "action_required": None}
+
+    def test_truncated_json_is_read_tolerantly(self):
+        summary = '{"title": "t", "impact_level": "HIGH", "action_required": true, "action": "Upgr'
+        assert parse_summary_fields(summary) == {"impact_level": "HIGH", "action_required": True}
+
+    def test_unknown_level_is_not_matched(self):
+        assert parse_summary_fields("Impact Level: SEVERE")["impact_level"] is None
+
+    def test_missing_fields(self):
+        assert parse_summary_fields("A plain BART summary.") == {"impact_level": None, "action_required": None}
+        assert parse_summary_fields(None) == {"impact_level": None, "action_required": None}
+        assert parse_summary_fields("") == {"impact_level": None, "action_required": None}
+
+
+class TestSplitStructuredBatchResponse:
+    @staticmethod
+    def _entry(index, level="LOW"):
+        return {"index": index, "title": "t", "what": "w", "why": "y",
+                "impact_level": level, "action_required": False, "action": ""}
+
+    def test_maps_entries_by_index(self):
+        response = json.dumps({"summaries": [self._entry(2, "HIGH"), self._entry(1)]})
+        parts = split_structured_batch_response(response, 2)
+        assert parse_summary_fields(parts[0])["impact_level"] == "LOW"
+        assert parse_summary_fields(parts[1])["impact_level"] == "HIGH"
+
+    def test_skips_missing_duplicated_and_invalid_entries(self):
+        entries = [self._entry(1), self._entry(1, "HIGH"), self._entry(9), {"index": 2}, "junk"]
+        parts = split_structured_batch_response(json.dumps({"summaries": entries}), 3)
+        assert list(parts) == [0]
+        assert parse_summary_fields(parts[0])["impact_level"] == "LOW"
+
+    def test_malformed_json(self):
+        assert split_structured_batch_response('{"summaries": [{"index": 1,', 2) == {}
+        assert split_structured_batch_response("not json", 2) == {}
@@ -0,0 +1,117 @@
+import pytest
+
+from src.utils import ratelimit
+from src.utils.ratelimit import HostRateLimiter, SlidingWindowRateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", fake)
+    return fake
+
+
+class TestTokenBucket:
+    def test_burst_then_rate(self, clock):
+        bucket = TokenBucket(rate=2, capacity=2)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.5)
+        assert bucket.reserve() == pytest.approx(1.0)
+
+    def test_refills_over_time_up_to_capacity(self, clock):
+        bucket = TokenBucket(rate=1, capacity=2)
+        bucket.reserve()
+        bucket.reserve()
+        clock.now += 10
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(1.0)
+
+    def test_block_delays_next_token(self, clock):
+        bucket = TokenBucket(rate=1, capacity=5)
+        bucket.block(30)
+        clock.now += 10
+        assert bucket.reserve() == pytest.approx(20)
+        clock.now += 20
+        # The blocked request used the one token available at the deadline
+        assert bucket.reserve() == pytest.approx(1.0)
+
+    def test_shorter_block_does_not_shorten_a_longer_one(self, clock):
+        bucket = TokenBucket(rate=1, capacity=1)
+        bucket.block(30)
+        bucket.block(5)
+        assert bucket.reserve() == pytest.approx(30)
+
+    def test_unlimited_rate_never_waits(self, clock):
+        bucket = TokenBucket(rate=0, capacity=1)
+        assert [bucket.reserve() for _ in range(100)] == [0] * 100
+
+    def test_unlimited_rate_still_honors_block(self, clock):
+        bucket = TokenBucket(rate=0, capacity=1)
+        bucket.block(12)
+        assert bucket.reserve() == pytest.approx(12)
+        clock.now += 12
+        assert bucket.reserve() == 0
+
+
+class TestHostRateLimiter:
+    def test_hosts_are_limited_independently(self, clock, monkeypatch):
+        slept = []
+        monkeypatch.setattr(ratelimit.time, "sleep", slept.append)
+        limiter = HostRateLimiter(rate=1, burst=1)
+        assert limiter.acquire("a.example") == 0
+        assert limiter.acquire("b.example") == 0
+        assert limiter.acquire("a.example") == pytest.approx(1.0)
+        assert slept == [pytest.approx(1.0)]
+
+    def test_defer_with_unlimited_rate(self, clock, monkeypatch):
+        slept = []
+        monkeypatch.setattr(ratelimit.time, "sleep", slept.append)
+        limiter = HostRateLimiter(rate=0)
+        limiter.defer("a.example", 20)
+        assert limiter.acquire("a.example") == pytest.approx(20)
+        assert limiter.acquire("b.example") == 0
+        assert slept == [pytest.approx(20)]
+
+
+class TestSlidingWindowRateLimiter:
+    def test_allows_calls_within_window(self, clock):
+        limiter = SlidingWindowRateLimiter(calls=3, period=60)
+        assert [limiter.reserve() for _ in range(3)] == [0, 0, 0]
+
+    def test_waiting_callers_get_successive_slots(self, clock):
+        limiter = SlidingWindowRateLimiter(calls=2, period=60)
+        limiter.reserve()
+        clock.now += 10
+        limiter.reserve()
+        # Slots free when each earlier call leaves the window, one at a time
+        assert limiter.reserve() == pytest.approx(50)
+        assert limiter.reserve() == pytest.approx(60)
+        assert limiter.reserve() == pytest.approx(110)
+
+    def test_window_slides(self, clock):
+        limiter = SlidingWindowRateLimiter(calls=1, period=60)
+        limiter.reserve()
+        clock.now += 60
+        assert limiter.reserve() == 0
+
+    def test_disabled(self, clock):
+        assert SlidingWindowRateLimiter(calls=0, period=60).reserve() == 0
+        assert SlidingWindowRateLimiter(calls=5, period=0).reserve() == 0
+
+    def test_acquire_sleeps_for_the_reserved_wait(self, clock, monkeypatch):
+        slept = []
+        monkeypatch.setattr(ratelimit.time, "sleep", slept.append)
+        limiter = SlidingWindowRateLimiter(calls=1, period=30)
+        assert limiter.acquire() == 0
+        assert limiter.acquire() == pytest.approx(30)
+        assert slept == [pytest.approx(30)]
@@ -0,0 +1,52 @@
+import pytest
+
+from src.engines import resilient
+from src.engines.base import BaseEngine
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class StubEngine(BaseEngine):
+    def summarize(self, text):
+        if text == "bad":
+            raise StatusError(400)
+        if text == "down":
+            raise StatusError(503)
+        return "ok"
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(resilient, "_breakers", {})
+    monkeypatch.setattr(resilient.engine_pool, "get", lambda engine_type, model: StubEngine())
+    return resilient.ResilientEngine("openai", "gpt-4o-mini", fallback_chain=[], max_retries=2, retry_delay=0)
+
+
+def test_request_errors_do_not_open_the_circuit(engine):
+    for _ in range(10):
+        with pytest.raises(StatusError):
+            engine.summarize("bad")
+    assert resilient.get_circuit_breaker("openai/gpt-4o-mini").state == "closed"
+    assert engine.summarize("good") == "ok"
+
+
+def test_transient_errors_open_the_circuit(engine, monkeypatch):
+    monkeypatch.setattr(resilient.settings, "AI_CIRCUIT_FAILURES", 2)
+    monkeypatch.setattr(resilient, "_breakers", {})
+    with pytest.raises(StatusError):
+        engine.summarize("down")
+    assert resilient.get_circuit_breaker("openai/gpt-4o-mini").state == "open"
+    with pytest.raises(RuntimeError, match="circuits open"):
+        engine.summarize("good")
+
+
+def test_request_error_ends_a_half_open_trial():
+    breaker = resilient.CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_request_error()
+    assert breaker.allow()